@@ -11,6 +11,14 @@ case "${API_PORT}" in
     ;;
 esac
 export API_PORT
+# One worker keeps scheduler/recorder state in-process; threads absorb
+# requests parked on Clash API calls and long-lived /api/logs/stream clients.
+API_THREADS="${API_THREADS:-16}"
+case "${API_THREADS}" in
+  ''|*[!0-9]*)
+    API_THREADS="16"
+    ;;
+esac
 MIHOMO_DIR="/root/.config/mihomo"
 MIHOMO_CORE_DIR="${MIHOMO_CORE_DIR:-/opt/mihomo-core}"
 MIHOMO_BIN="${MIHOMO_BIN:-${MIHOMO_CORE_DIR}/mihomo}"
@@ -236,7 +244,7 @@ if ! kernel_self_check "${MIHOMO_BIN}"; then
 fi
 
 if [ -f /scripts/api_server.py ]; then
-  cd /scripts && "${PYTHON_BIN}" -m gunicorn api_server:app -b 0.0.0.0:${API_PORT} -w 1 --threads 4 --timeout 120 --keep-alive 5 &
+  cd /scripts && "${PYTHON_BIN}" -m gunicorn api_server:app -b 0.0.0.0:${API_PORT} -w 1 -k gthread --threads "${API_THREADS}" --timeout 120 --keep-alive 5 &
   echo "[ok] api server started on ${API_PORT}"
 fi
 
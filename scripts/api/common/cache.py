@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import threading
+import time
+
+
+class TtlCache:
+    """Tiny keyed cache whose entries expire `ttl` seconds after being stored."""
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._items: dict[object, tuple[float, object]] = {}
+
+    def get(self, key: object = None, default=None):
+        with self._lock:
+            item = self._items.get(key)
+        if item is None or time.monotonic() >= item[0]:
+            return default
+        return item[1]
+
+    def set(self, value, key: object = None) -> None:
+        with self._lock:
+            self._items[key] = (time.monotonic() + self.ttl, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
@@ -179,6 +179,7 @@ class ConnectionRecordConfig:
 
     enabled: bool = field(default_factory=lambda: _parse_bool("CONNECTION_RECORD_ENABLED", True))
     interval: int = field(default_factory=lambda: _parse_int("CONNECTION_RECORD_INTERVAL", 6, min_val=3))
+    idle_backoff: int = field(default_factory=lambda: _parse_int("CONNECTION_RECORD_IDLE_BACKOFF", 0, min_val=0))
     max_records: int = field(default_factory=lambda: _parse_int("MAX_PROXY_RECORDS", 1000, min_val=100))
 
 
@@ -217,6 +218,7 @@ class Constants:
     }))
     safe_name_pattern: re.Pattern = field(default_factory=lambda: re.compile(r"^[A-Za-z0-9._-]{1,64}$"))
     safe_repo_pattern: re.Pattern = field(default_factory=lambda: re.compile(r"^[A-Za-z0-9_.-]+/[A-Za-z0-9_.-]+$"))
+    default_exclude_filter: str = "(?i)(expired|官网|剩余|流量)"
     auto_set_block_start: str = "// === AUTO-SUB-SETS:START ==="
     auto_set_block_end: str = "// === AUTO-SUB-SETS:END ==="
 
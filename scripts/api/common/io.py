@@ -1,28 +1,59 @@
 from __future__ import annotations
 
 import json
+import os
 import shutil
+import threading
 from datetime import datetime
 from pathlib import Path
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as YamlSafeLoader
+
 
 def load_json(path: Path, default):
-    if not path.exists():
-        return default
+    # json.loads takes bytes directly; one read, no exists() stat or text wrapper.
     try:
-        with path.open("r", encoding="utf-8") as fh:
-            data = json.load(fh)
-        return data
+        return json.loads(path.read_bytes())
     except Exception:
         return default
 
 
-def save_json(path: Path, data) -> None:
+def _temp_sibling(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def replace_text(path: Path, content: str) -> None:
+    """Write via a sibling temp file + os.replace so readers never see a partial file."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as fh:
-        json.dump(data, fh, ensure_ascii=False, indent=2)
+    tmp_path = _temp_sibling(path)
+    try:
+        tmp_path.write_text(content, encoding="utf-8")
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def save_json(path: Path, data) -> None:
+    replace_text(path, json.dumps(data, ensure_ascii=False, indent=2))
+
+
+def parse_yaml(content):
+    return yaml.load(content, Loader=YamlSafeLoader)
+
+
+def dump_yaml(data) -> str:
+    # Stay on the pure-Python dumper: libyaml escapes non-BMP characters such as
+    # flag emoji in proxy names even with allow_unicode, which makes files unreadable.
+    return yaml.safe_dump(data, allow_unicode=True, sort_keys=False)
 
 
 def load_yaml(path: Path, default):
@@ -30,16 +61,14 @@ def load_yaml(path: Path, default):
         return default
     try:
         with path.open("r", encoding="utf-8") as fh:
-            data = yaml.safe_load(fh)
+            data = parse_yaml(fh)
         return data if data is not None else default
     except Exception:
         return default
 
 
 def save_yaml(path: Path, data) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as fh:
-        yaml.safe_dump(data, fh, allow_unicode=True, sort_keys=False)
+    replace_text(path, dump_yaml(data))
 
 
 def read_text(path: Path) -> str:
@@ -52,8 +81,40 @@ def read_text(path: Path) -> str:
 
 
 def write_text(path: Path, content: str) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(content, encoding="utf-8")
+    replace_text(path, content)
+
+
+def copy_file(src: Path, dst: Path) -> None:
+    """Replace `dst` with the contents and mtime of `src`, skipping copy2's chmod/xattr pass.
+
+    copy_file_range lets the kernel copy (or reflink) without a userspace buffer;
+    filesystems that refuse it fall back to a plain stream copy.
+    """
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = _temp_sibling(dst)
+    try:
+        with src.open("rb") as fin, tmp_path.open("wb") as fout:
+            st = os.fstat(fin.fileno())
+            try:
+                remaining = st.st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fin.fileno(), fout.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            except (AttributeError, OSError):
+                fin.seek(0)
+                fout.seek(0)
+                fout.truncate()
+                shutil.copyfileobj(fin, fout)
+        os.utime(tmp_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        os.replace(tmp_path, dst)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
 
 
 def make_backup(path: Path, label: str = "") -> None:
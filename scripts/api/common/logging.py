@@ -1,46 +1,54 @@
 from __future__ import annotations
 
+import json
 import queue
 import threading
+from collections import deque
 from datetime import datetime
 
+MAX_LOG_HISTORY = 500
+
 log_lock = threading.Lock()
 log_queues: list[queue.Queue] = []
-log_history: list[dict] = []
-MAX_LOG_HISTORY = 500
+log_history: deque[dict] = deque(maxlen=MAX_LOG_HISTORY)
+# SSE frames for log_history, encoded once in emit_log and shared by every stream.
+log_frames: deque[bytes] = deque(maxlen=MAX_LOG_HISTORY)
+
+
+def encode_sse_frame(entry: dict) -> bytes:
+    return f"data: {json.dumps(entry, ensure_ascii=False)}\n\n".encode("utf-8")
 
 
 def emit_log(msg: str, level: str = "INFO") -> None:
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     entry = {"time": now, "level": level, "msg": msg}
+    frame = encode_sse_frame(entry)
+    # Snapshot subscribers together with the history append so a concurrent
+    # subscribe sees each entry exactly once, then fan out without the lock.
     with log_lock:
         log_history.append(entry)
-        if len(log_history) > MAX_LOG_HISTORY:
-            log_history.pop(0)
-        stale: list[queue.Queue] = []
-        for item in log_queues:
-            try:
-                item.put_nowait(entry)
-            except Exception:
-                stale.append(item)
-        for item in stale:
-            try:
-                log_queues.remove(item)
-            except ValueError:
-                pass
+        log_frames.append(frame)
+        subscribers = tuple(log_queues)
+    for item in subscribers:
+        try:
+            item.put_nowait(frame)
+        except queue.Full:
+            # Slow reader: drop this entry for it rather than the whole stream.
+            pass
     print(f"[{now}] [{level}] {msg}", flush=True)
 
 
 def get_recent_logs(limit: int = 200) -> list[dict]:
     with log_lock:
-        return list(log_history[-limit:])
+        return list(log_history)[-limit:]
 
 
-def subscribe_log_queue(maxsize: int = 128, history_limit: int = 30) -> tuple[queue.Queue, list[dict]]:
+def subscribe_log_queue(maxsize: int = 128, history_limit: int = 30) -> tuple[queue.Queue, list[bytes]]:
+    """Register a subscriber queue of pre-encoded SSE frames; returns it with recent frames."""
     q: queue.Queue = queue.Queue(maxsize=maxsize)
     with log_lock:
         log_queues.append(q)
-        history = list(log_history[-history_limit:])
+        history = list(log_frames)[-history_limit:]
     return q, history
 
 
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+
+def as_dict(value) -> dict:
+    return value if type(value) is dict else {}
+
+
+def as_list(value) -> list:
+    return value if type(value) is list else []
+
+
+def safe_int(value, default: int = 0) -> int:
+    try:
+        return int(value)
+    except Exception:
+        return default
@@ -1,6 +1,6 @@
 """Service layer package for incremental API refactoring."""
 
-from .clash_client import build_clash_headers, reload_clash_config
+from .clash_client import build_clash_headers, build_clash_session, reload_clash_config
 from .file_service import validate_js_override
 from .geo_service import GeoService
 from .kernel_service import KernelService
@@ -13,6 +13,7 @@ __all__ = [
     "MergeService",
     "ProviderService",
     "build_clash_headers",
+    "build_clash_session",
     "reload_clash_config",
     "validate_js_override",
 ]
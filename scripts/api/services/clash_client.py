@@ -6,6 +6,16 @@ from pathlib import Path
 from typing import Callable
 
 import requests
+from requests.adapters import HTTPAdapter
+
+
+def build_clash_session(pool_maxsize: int = 32) -> requests.Session:
+    """Shared keep-alive session for controller calls; retries stay with the callers."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=pool_maxsize, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
 
 
 def build_clash_headers(clash_secret: str) -> dict[str, str]:
@@ -19,9 +29,11 @@ def _reload_clash_with_path(
     *,
     clash_api: str,
     headers: dict[str, str],
+    session: requests.Session | None = None,
 ) -> tuple[bool, str]:
+    http = session or requests
     try:
-        response = requests.put(
+        response = http.put(
             f"{clash_api}/configs",
             json={"path": str(path)},
             headers=headers,
@@ -78,6 +90,7 @@ def reload_clash_config(
     clash_secret: str,
     emit_log: Callable[..., None],
     preferred_reload_path: str = "",
+    session: requests.Session | None = None,
 ) -> bool:
     headers = build_clash_headers(clash_secret)
 
@@ -86,14 +99,14 @@ def reload_clash_config(
     if preferred_path:
         prefer_target = Path(preferred_path)
         if _prepare_safe_reload_file(config_file, prefer_target):
-            ok, msg = _reload_clash_with_path(prefer_target, clash_api=clash_api, headers=headers)
+            ok, msg = _reload_clash_with_path(prefer_target, clash_api=clash_api, headers=headers, session=session)
             if ok:
                 return True
             emit_log(f"reload via CLASH_RELOAD_PATH failed: {msg}", "WARN")
         else:
             emit_log(f"failed to sync config to CLASH_RELOAD_PATH: {prefer_target}", "WARN")
 
-    ok, msg = _reload_clash_with_path(config_file, clash_api=clash_api, headers=headers)
+    ok, msg = _reload_clash_with_path(config_file, clash_api=clash_api, headers=headers, session=session)
     if ok:
         return True
 
@@ -106,7 +119,7 @@ def reload_clash_config(
         safe_target = safe_dir / "clash-web-runtime-config.yaml"
         if not _prepare_safe_reload_file(config_file, safe_target):
             continue
-        ok2, msg2 = _reload_clash_with_path(safe_target, clash_api=clash_api, headers=headers)
+        ok2, msg2 = _reload_clash_with_path(safe_target, clash_api=clash_api, headers=headers, session=session)
         if ok2:
             emit_log(f"reload succeeded via safe path: {safe_target}")
             return True
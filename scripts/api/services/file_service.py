@@ -1,14 +1,10 @@
 from __future__ import annotations
 
+import shutil
 import subprocess
+from functools import lru_cache
 
-
-def validate_js_override(content: str, *, node_bin: str = "node", timeout: int = 10) -> tuple[bool, str]:
-    script = str(content or "").strip()
-    if not script:
-        return False, "script is empty"
-
-    js_checker = r"""
+JS_OVERRIDE_CHECKER = r"""
 const fs = require("fs");
 const code = fs.readFileSync(0, "utf8");
 try {
@@ -23,9 +19,23 @@ try {
   process.exit(2);
 }
 """
+
+
+@lru_cache(maxsize=8)
+def resolve_node_bin(node_bin: str) -> str:
+    # Resolve PATH once; fall back to the bare name so a missing runtime still
+    # surfaces as FileNotFoundError from subprocess.
+    return shutil.which(node_bin) or node_bin
+
+
+def validate_js_override(content: str, *, node_bin: str = "node", timeout: int = 10) -> tuple[bool, str]:
+    script = str(content or "").strip()
+    if not script:
+        return False, "script is empty"
+
     try:
         result = subprocess.run(
-            [node_bin, "-e", js_checker],
+            [resolve_node_bin(node_bin), "-e", JS_OVERRIDE_CHECKER],
             input=script,
             capture_output=True,
             text=True,
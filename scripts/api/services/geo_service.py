@@ -1,25 +1,50 @@
 from __future__ import annotations
 
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import itemgetter
 from typing import Callable
-from urllib.parse import quote
+from urllib.parse import quote, quote_from_bytes
 
 import requests
 
+from ..common.values import as_dict, safe_int
+
 RETRYABLE_STATUS_CODES = {408, 409, 423, 425, 429, 500, 502, 503, 504}
+# (alternative keywords, weight) used to probe the most "proxy-like" groups first.
+GROUP_RANK_KEYWORDS = (
+    (("proxy",), 120),
+    (("auto",), 90),
+    (("global",), 80),
+    (("select", "选择"), 40),
+    (("google",), 20),
+)
+
+
+def group_rank_score(name: str) -> int:
+    lowered = name.lower()
+    return sum(weight for keywords, weight in GROUP_RANK_KEYWORDS if any(k in lowered for k in keywords))
 
 
 class GeoService:
+    # How long the last reachable proxy is trusted as a fast-path candidate.
+    last_good_ttl = 60.0
+    # Rule provider refreshes are independent, so they are issued in parallel.
+    rule_provider_workers = 8
+
     def __init__(
         self,
         *,
         clash_api: str,
         clash_headers: Callable[[], dict],
+        session: requests.Session,
         system_proxy_names: set[str],
     ) -> None:
         self.clash_api = clash_api
         self.clash_headers = clash_headers
+        self.session = session
         self.system_proxy_names = {str(x).upper() for x in system_proxy_names}
+        self._last_good: dict | None = None
 
     def clash_delay_request(
         self,
@@ -31,7 +56,7 @@ class GeoService:
         timeout_ms = max(1000, min(20000, int(timeout_ms)))
         request_timeout = max(3.0, timeout_ms / 1000.0 + 2.0)
         try:
-            resp = requests.get(
+            resp = self.session.get(
                 f"{self.clash_api}/proxies/{encoded}/delay",
                 headers=self.clash_headers(),
                 params={"url": test_url, "timeout": timeout_ms},
@@ -50,7 +75,7 @@ class GeoService:
 
     def fetch_rule_provider_rows(self) -> tuple[list[dict], str]:
         try:
-            resp = requests.get(
+            resp = self.session.get(
                 f"{self.clash_api}/providers/rules",
                 headers=self.clash_headers(),
                 timeout=8,
@@ -58,33 +83,32 @@ class GeoService:
             if resp.status_code != 200:
                 return [], f"clash api error: {resp.status_code}"
             payload = resp.json() if resp.content else {}
-            raw_providers = payload.get("providers", {}) if isinstance(payload, dict) else {}
-            if not isinstance(raw_providers, dict):
-                raw_providers = {}
+            raw_providers = as_dict(as_dict(payload).get("providers"))
 
-            rows: list[dict] = []
+            # Decorate with the lowered name once so sorting does not rebuild it.
+            keyed: list[tuple[str, dict]] = []
             for provider_name, item in raw_providers.items():
                 if not isinstance(item, dict):
                     continue
-                rule_count_raw = item.get("ruleCount", 0)
-                try:
-                    rule_count = max(0, int(rule_count_raw))
-                except Exception:
-                    rule_count = 0
-                rows.append(
-                    {
-                        "name": str(provider_name),
-                        "type": str(item.get("type", "")),
-                        "behavior": str(item.get("behavior", "")),
-                        "format": str(item.get("format", "")),
-                        "vehicle_type": str(item.get("vehicleType", "")),
-                        "rule_count": rule_count,
-                        "updated_at": str(item.get("updatedAt", "")),
-                    }
+                rule_count = max(0, safe_int(item.get("ruleCount", 0)))
+                name = str(provider_name)
+                keyed.append(
+                    (
+                        name.lower(),
+                        {
+                            "name": name,
+                            "type": str(item.get("type", "")),
+                            "behavior": str(item.get("behavior", "")),
+                            "format": str(item.get("format", "")),
+                            "vehicle_type": str(item.get("vehicleType", "")),
+                            "rule_count": rule_count,
+                            "updated_at": str(item.get("updatedAt", "")),
+                        },
+                    )
                 )
 
-            rows.sort(key=lambda x: x["name"].lower())
-            return rows, ""
+            keyed.sort(key=itemgetter(0))
+            return [row for _, row in keyed], ""
         except Exception as exc:
             return [], str(exc)
 
@@ -92,9 +116,37 @@ class GeoService:
         self,
         test_url: str = "http://www.gstatic.com/generate_204",
         timeout_ms: int = 6000,
+        max_concurrency: int = 4,
     ) -> dict:
+        last_good = self._last_good
+        if last_good is not None and time.monotonic() - last_good["ts"] < self.last_good_ttl:
+            ok, delay, error = self.clash_delay_request(
+                last_good["proxy"],
+                test_url=test_url,
+                timeout_ms=min(int(timeout_ms), 2000),
+            )
+            if ok:
+                return {
+                    "ok": True,
+                    "message": "proxy reachable",
+                    "tested_url": test_url,
+                    "group": last_good["group"],
+                    "proxy": last_good["proxy"],
+                    "delay": delay,
+                    "attempts": [
+                        {
+                            "group": last_good["group"],
+                            "proxy": last_good["proxy"],
+                            "ok": ok,
+                            "delay": delay,
+                            "error": error,
+                        }
+                    ],
+                }
+            self._last_good = None
+
         try:
-            resp = requests.get(f"{self.clash_api}/proxies", headers=self.clash_headers(), timeout=6)
+            resp = self.session.get(f"{self.clash_api}/proxies", headers=self.clash_headers(), timeout=6)
             if resp.status_code != 200:
                 return {
                     "ok": False,
@@ -103,9 +155,7 @@ class GeoService:
                     "attempts": [],
                 }
             payload = resp.json() if resp.content else {}
-            raw_proxies = payload.get("proxies", {}) if isinstance(payload, dict) else {}
-            if not isinstance(raw_proxies, dict):
-                raw_proxies = {}
+            raw_proxies = as_dict(as_dict(payload).get("proxies"))
         except Exception as exc:
             return {
                 "ok": False,
@@ -126,78 +176,85 @@ class GeoService:
             nodes = [str(x).strip() for x in options if str(x).strip()]
             if not nodes:
                 continue
-            groups.append({"name": name, "now": now, "nodes": nodes})
-
-        def group_rank(group: dict) -> tuple[int, int]:
-            lowered = str(group.get("name", "")).lower()
-            score = 0
-            if "proxy" in lowered:
-                score += 120
-            if "auto" in lowered:
-                score += 90
-            if "global" in lowered:
-                score += 80
-            if "select" in lowered or "选择" in lowered:
-                score += 40
-            if "google" in lowered:
-                score += 20
-            nodes = group.get("nodes", [])
-            return (-score, -len(nodes) if isinstance(nodes, list) else 0)
-
-        groups.sort(key=group_rank)
+            groups.append(
+                {
+                    "name": name,
+                    "now": now,
+                    "nodes": nodes,
+                    "rank": (-group_rank_score(name), -len(nodes)),
+                }
+            )
 
-        attempts: list[dict] = []
-        for group in groups:
-            group_name = str(group["name"])
-            nodes = list(group["nodes"])
-            candidates: list[str] = []
-            current = str(group.get("now", "")).strip()
-            if current:
-                candidates.append(current)
-            candidates.extend(nodes)
-
-            deduped: list[str] = []
-            seen: set[str] = set()
-            for node in candidates:
-                key = node.upper()
-                if key in seen:
-                    continue
-                seen.add(key)
-                deduped.append(node)
+        groups.sort(key=itemgetter("rank"))
 
-            for node in deduped:
-                if node.upper() in self.system_proxy_names:
-                    continue
-                ok, delay, error = self.clash_delay_request(
-                    node,
-                    test_url=test_url,
-                    timeout_ms=timeout_ms,
-                )
-                attempt = {
-                    "group": group_name,
-                    "proxy": node,
-                    "ok": ok,
-                    "delay": delay,
-                    "error": error,
-                }
-                attempts.append(attempt)
-                if ok:
-                    return {
-                        "ok": True,
-                        "message": "proxy reachable",
-                        "tested_url": test_url,
-                        "group": group_name,
-                        "proxy": node,
-                        "delay": delay,
-                        "attempts": attempts[:6],
-                    }
-                if len(attempts) >= 8:
-                    return {
-                        "ok": False,
-                        "message": "no reachable proxy in tested groups",
-                        "tested_url": test_url,
-                        "attempts": attempts,
+        attempts: list[dict] = []
+        workers = max(1, int(max_concurrency))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="geo-check")
+        try:
+            for group in groups:
+                group_name = str(group["name"])
+                nodes = list(group["nodes"])
+                candidates: list[str] = []
+                current = str(group.get("now", "")).strip()
+                if current:
+                    candidates.append(current)
+                candidates.extend(nodes)
+
+                deduped: list[str] = []
+                seen: set[str] = set()
+                for node in candidates:
+                    key = node.upper()
+                    if key in seen or key in self.system_proxy_names:
+                        continue
+                    seen.add(key)
+                    deduped.append(node)
+
+                # Probe in waves of `workers` so the first reachable node wins without
+                # waiting for slower siblings; in-flight probes are simply abandoned.
+                for start in range(0, len(deduped), workers):
+                    budget = 8 - len(attempts)
+                    batch = deduped[start : start + min(workers, budget)]
+                    futures = {
+                        executor.submit(
+                            self.clash_delay_request,
+                            node,
+                            test_url=test_url,
+                            timeout_ms=timeout_ms,
+                        ): node
+                        for node in batch
                     }
+                    for future in as_completed(futures):
+                        node = futures[future]
+                        ok, delay, error = future.result()
+                        attempts.append(
+                            {
+                                "group": group_name,
+                                "proxy": node,
+                                "ok": ok,
+                                "delay": delay,
+                                "error": error,
+                            }
+                        )
+                        if ok:
+                            self._last_good = {"group": group_name, "proxy": node, "ts": time.monotonic()}
+                            return {
+                                "ok": True,
+                                "message": "proxy reachable",
+                                "tested_url": test_url,
+                                "group": group_name,
+                                "proxy": node,
+                                "delay": delay,
+                                "attempts": attempts[:6],
+                            }
+                    if len(attempts) >= 8:
+                        return {
+                            "ok": False,
+                            "message": "no reachable proxy in tested groups",
+                            "tested_url": test_url,
+                            "attempts": attempts,
+                        }
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
         return {
             "ok": False,
@@ -272,13 +329,15 @@ class GeoService:
         attempts: int = 1,
     ) -> tuple[requests.Response | None, str]:
         safe_attempts = max(1, int(attempts))
+        url = f"{self.clash_api}{path}"
+        headers = self.clash_headers()
         last_error = ""
         for attempt in range(1, safe_attempts + 1):
             try:
-                response = requests.request(
+                response = self.session.request(
                     method,
-                    f"{self.clash_api}{path}",
-                    headers=self.clash_headers(),
+                    url,
+                    headers=headers,
                     timeout=timeout,
                 )
                 if response.status_code in (200, 204):
@@ -369,6 +428,25 @@ class GeoService:
             "failed_names": [],
         }
 
+    def put_rule_providers(
+        self, names: list[str], timeout: float
+    ) -> list[tuple[requests.Response | None, str]]:
+        """Refresh each named rule provider concurrently; results follow `names` order."""
+        if not names:
+            return []
+
+        def put(name: str) -> tuple[requests.Response | None, str]:
+            return self.clash_request_with_retry(
+                "PUT",
+                "/providers/rules/" + quote_from_bytes(name.encode("utf-8"), safe=b""),
+                timeout=timeout,
+                attempts=2,
+            )
+
+        workers = min(self.rule_provider_workers, len(names))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rule-provider") as executor:
+            return list(executor.map(put, names))
+
     def update_rule_providers(self) -> dict:
         provider_rows, providers_error = self.fetch_rule_provider_rows()
         provider_items: list[dict] = []
@@ -387,13 +465,9 @@ class GeoService:
                     "updated_at": str(row.get("updated_at", "")).strip(),
                     "rule_count": row.get("rule_count", 0),
                 }
-                encoded = quote(name, safe="")
-                resp, request_error = self.clash_request_with_retry(
-                    "PUT",
-                    f"/providers/rules/{encoded}",
-                    timeout=30,
-                    attempts=2,
-                )
+
+            names = list(provider_before_map)
+            for name, (resp, request_error) in zip(names, self.put_rule_providers(names, timeout=30)):
                 if resp is None:
                     provider_items.append(
                         {"name": name, "ok": False, "error": request_error or "request failed"}
@@ -411,17 +485,9 @@ class GeoService:
             ]
             if retry_candidates:
                 time.sleep(1.0)
-                for item in retry_candidates:
-                    name = str(item.get("name", "")).strip()
-                    if not name:
-                        continue
-                    encoded = quote(name, safe="")
-                    resp, request_error = self.clash_request_with_retry(
-                        "PUT",
-                        f"/providers/rules/{encoded}",
-                        timeout=35,
-                        attempts=2,
-                    )
+                retry_names = [str(item.get("name", "")).strip() for item in retry_candidates]
+                retry_results = self.put_rule_providers(retry_names, timeout=35)
+                for item, (resp, request_error) in zip(retry_candidates, retry_results):
                     if resp is None:
                         retry_error = request_error or "request failed"
                         prev_error = str(item.get("error", "")).strip()
@@ -455,9 +521,8 @@ class GeoService:
                         "rule_count": row.get("rule_count", 0),
                     }
 
-        failed_count = len([x for x in provider_items if not x.get("ok")])
-        updated_count = len([x for x in provider_items if x.get("ok")])
         total_count = len(provider_items)
+        updated_count = 0
         provider_changed_count = 0
         provider_unchanged_count = 0
         provider_unknown_count = 0
@@ -474,6 +539,7 @@ class GeoService:
                 provider_unknown_count += 1
                 continue
 
+            updated_count += 1
             before_meta = provider_before_map.get(name, {})
             after_meta = provider_after_map.get(name, {})
             before_updated_at = str(before_meta.get("updated_at", "")).strip()
@@ -481,14 +547,8 @@ class GeoService:
             item["before_updated_at"] = before_updated_at
             item["after_updated_at"] = after_updated_at
 
-            try:
-                before_rule_count = int(before_meta.get("rule_count", 0))
-            except Exception:
-                before_rule_count = 0
-            try:
-                after_rule_count = int(after_meta.get("rule_count", 0))
-            except Exception:
-                after_rule_count = 0
+            before_rule_count = safe_int(before_meta.get("rule_count", 0))
+            after_rule_count = safe_int(after_meta.get("rule_count", 0))
             item["before_rule_count"] = before_rule_count
             item["after_rule_count"] = after_rule_count
 
@@ -521,6 +581,7 @@ class GeoService:
                 item["new_data"] = "no"
                 provider_unchanged_count += 1
 
+        failed_count = total_count - updated_count
         if providers_error and not provider_rows:
             total_count = 0
             updated_count = 0
@@ -539,6 +600,28 @@ class GeoService:
             "failed_names": provider_failed_names,
         }
 
+    def run_geo_updates(
+        self,
+        *,
+        update_geo_db: bool,
+        update_rule_providers: bool,
+    ) -> tuple[dict, dict]:
+        """Run the GEO database update and rule provider refresh side by side."""
+        if not update_geo_db:
+            geo_db_result = {"status": "skipped", "message": "not requested", "new_data": "unknown"}
+            if not update_rule_providers:
+                return geo_db_result, self.empty_rule_provider_update_result()
+            return geo_db_result, self.update_rule_providers()
+        if not update_rule_providers:
+            return self.perform_geo_db_update(), self.empty_rule_provider_update_result()
+
+        # The two controller calls are independent, so overlap them instead of
+        # waiting for POST /configs/geo before starting the provider refreshes.
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="geo-db") as executor:
+            geo_future = executor.submit(self.perform_geo_db_update)
+            provider_result = self.update_rule_providers()
+            return geo_future.result(), provider_result
+
     def compose_geo_update_result(
         self,
         check_result: dict,
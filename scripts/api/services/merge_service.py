@@ -9,6 +9,11 @@ from typing import Callable
 
 
 class MergeService:
+    # History entries are buffered and written in batches to avoid rewriting
+    # the whole history file on every append.
+    history_flush_size = 16
+    history_flush_interval = 5.0
+
     def __init__(
         self,
         *,
@@ -37,6 +42,8 @@ class MergeService:
         self.merge_lock = merge_lock
         self.schedule_lock = schedule_lock
         self.history_lock = history_lock
+        self._history_buffer: list[dict] = []
+        self._history_flush_ts = 0.0
 
     def default_schedule(self) -> dict:
         return {
@@ -105,8 +112,26 @@ class MergeService:
         return self.sanitize_schedule_history_items(raw.get("items", []))
 
     def save_schedule_history(self, items: list[dict]) -> None:
+        # Caller holds history_lock; `items` is authoritative, so drop anything still buffered.
         payload = {"items": self.sanitize_schedule_history_items(items)}
         self.save_json(self.schedule_history_file, payload)
+        self._history_buffer.clear()
+        self._history_flush_ts = time.monotonic()
+
+    def read_schedule_history(self) -> list[dict]:
+        """On-disk history plus buffered entries; caller holds history_lock."""
+        items = self.load_schedule_history()
+        if self._history_buffer:
+            items = self.sanitize_schedule_history_items(items + self._history_buffer)
+        return items
+
+    def flush_schedule_history(self, force: bool = True) -> None:
+        with self.history_lock:
+            if not self._history_buffer:
+                return
+            if not force and time.monotonic() - self._history_flush_ts < self.history_flush_interval:
+                return
+            self.save_schedule_history(self.load_schedule_history() + self._history_buffer)
 
     def now_iso(self) -> str:
         return datetime.now().replace(microsecond=0).isoformat()
@@ -134,9 +159,13 @@ class MergeService:
             "message": message,
         }
         with self.history_lock:
-            items = self.load_schedule_history()
-            items.append(entry)
-            self.save_schedule_history(items)
+            self._history_buffer.append(entry)
+            if (
+                len(self._history_buffer) < self.history_flush_size
+                and time.monotonic() - self._history_flush_ts < self.history_flush_interval
+            ):
+                return
+            self.save_schedule_history(self.load_schedule_history() + self._history_buffer)
 
     def run_merge_job(self, *, do_reload: bool, trigger: str) -> tuple[bool, str]:
         self.emit_log(f"{trigger}: merge started")
@@ -212,6 +241,7 @@ class MergeService:
     def scheduler_loop(self) -> None:
         while True:
             time.sleep(5)
+            self.flush_schedule_history(force=False)
             with self.schedule_lock:
                 schedule = self.load_schedule()
 
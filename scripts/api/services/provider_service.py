@@ -9,6 +9,8 @@ from urllib.parse import quote
 
 import requests
 
+from ..common.values import as_dict, as_list, safe_int
+
 
 class ProviderService:
     def __init__(
@@ -16,6 +18,7 @@ class ProviderService:
         *,
         clash_api: str,
         clash_headers: Callable[[], dict],
+        session: requests.Session,
         provider_recovery_file: Path,
         provider_auto_refresh_enabled: bool,
         provider_recovery_check_interval: int,
@@ -28,6 +31,7 @@ class ProviderService:
     ) -> None:
         self.clash_api = clash_api
         self.clash_headers = clash_headers
+        self.session = session
         self.provider_recovery_file = provider_recovery_file
         self.provider_auto_refresh_enabled = provider_auto_refresh_enabled
         self.provider_recovery_check_interval = provider_recovery_check_interval
@@ -87,29 +91,22 @@ class ProviderService:
         self.save_json(self.provider_recovery_file, payload)
 
     def build_provider_rows(self, payload) -> list[dict]:
-        raw_providers = payload.get("providers", {}) if isinstance(payload, dict) else {}
-        if not isinstance(raw_providers, dict):
-            raw_providers = {}
+        raw_providers = as_dict(as_dict(payload).get("providers"))
 
         rows: list[dict] = []
         for provider_name, item in raw_providers.items():
             if not isinstance(item, dict):
                 continue
 
-            proxies = item.get("proxies", [])
-            proxy_count = 0
-            alive_count = 0
-            if isinstance(proxies, list):
-                proxy_count = len(proxies)
-                alive_count = sum(
-                    1
-                    for proxy in proxies
-                    if isinstance(proxy, dict) and proxy.get("alive") is True
-                )
-
-            subscription_info = item.get("subscriptionInfo")
-            if not isinstance(subscription_info, dict):
-                subscription_info = {}
+            proxies = as_list(item.get("proxies"))
+            proxy_count = len(proxies)
+            alive_count = sum(
+                1
+                for proxy in proxies
+                if isinstance(proxy, dict) and proxy.get("alive") is True
+            )
+
+            subscription_info = as_dict(item.get("subscriptionInfo"))
 
             rows.append(
                 {
@@ -128,7 +125,7 @@ class ProviderService:
         return rows
 
     def fetch_provider_rows(self, timeout: int = 8) -> list[dict]:
-        resp = requests.get(
+        resp = self.session.get(
             f"{self.clash_api}/providers/proxies",
             headers=self.clash_headers(),
             timeout=timeout,
@@ -141,7 +138,7 @@ class ProviderService:
     def refresh_provider_subscription(self, provider_name: str) -> tuple[bool, str]:
         encoded_name = quote(provider_name, safe="")
         try:
-            resp = requests.put(
+            resp = self.session.put(
                 f"{self.clash_api}/providers/proxies/{encoded_name}",
                 headers=self.clash_headers(),
                 timeout=12,
@@ -208,23 +205,14 @@ class ProviderService:
                             zero_since_dt = datetime.fromisoformat(zero_since_raw)
                         except Exception:
                             zero_since_dt = None
-                    try:
-                        daily_updates = max(0, int(entry.get("daily_updates", 0)))
-                    except Exception:
-                        daily_updates = 0
+                    daily_updates = max(0, safe_int(entry.get("daily_updates", 0)))
                     daily_date = str(entry.get("daily_date") or "").strip()
                     if daily_date != today:
                         daily_date = today
                         daily_updates = 0
 
-                    try:
-                        proxy_count = max(0, int(row.get("proxy_count", 0)))
-                    except Exception:
-                        proxy_count = 0
-                    try:
-                        alive_count = max(0, int(row.get("alive_count", 0)))
-                    except Exception:
-                        alive_count = 0
+                    proxy_count = max(0, safe_int(row.get("proxy_count", 0)))
+                    alive_count = max(0, safe_int(row.get("alive_count", 0)))
 
                     vehicle_type = str(row.get("vehicle_type", "")).strip().lower()
                     supports_refresh = vehicle_type == "http"
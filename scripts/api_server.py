@@ -5,11 +5,11 @@ Management API for Clash single-host deployment.
 
 from __future__ import annotations
 
+import atexit
 import json
 import os
 import queue
 import re
-import shutil
 import subprocess
 import tempfile
 import threading
@@ -18,6 +18,7 @@ import hashlib
 import gzip
 from collections import Counter
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 import signal
 from urllib.parse import quote, urlparse
@@ -28,10 +29,22 @@ from flask import Flask, Response, jsonify, request, send_from_directory, stream
 from flask_cors import CORS
 from connection_recorder import ClashConnectionRecorder, ProxyRecordStore
 from api.common.auth import configure_write_auth, require_write_auth
-from api.common.io import load_json, load_yaml, make_backup, read_text, save_json, save_yaml, write_text
+from api.common.cache import TtlCache
+from api.common.io import (
+    copy_file,
+    load_json,
+    load_yaml,
+    make_backup,
+    parse_yaml,
+    read_text,
+    save_json,
+    save_yaml,
+    write_text,
+)
 from api.common.logging import emit_log, get_recent_logs, subscribe_log_queue, unsubscribe_log_queue
 from api.common.responses import json_error
-from api.services.clash_client import build_clash_headers, reload_clash_config
+from api.common.values import as_dict, safe_int
+from api.services.clash_client import build_clash_headers, build_clash_session, reload_clash_config
 from api.services.file_service import validate_js_override
 from api.services.geo_service import GeoService
 from api.services.kernel_service import KernelService
@@ -46,6 +59,10 @@ for warning in cfg.validate_security():
     print(f"[Security] {warning}", flush=True)
 
 app = Flask(__name__)
+# Group/proxy payloads are large and full of CJK names: skip the per-dict key
+# sort and emit UTF-8 directly instead of \uXXXX escapes.
+app.json.sort_keys = False
+app.json.ensure_ascii = False
 CORS(app, resources={r"/api/*": {"origins": "*"}})
 configure_write_auth(cfg.auth.admin_token)
 
@@ -57,18 +74,32 @@ kernel_update_lock = threading.Lock()
 restart_lock = threading.Lock()
 
 
+# The secret is fixed for the process lifetime, so build the headers once.
+# Callers only pass this dict to requests, which never mutates it.
+_clash_headers = build_clash_headers(cfg.auth.clash_secret)
+
+
 def clash_headers() -> dict:
-    return build_clash_headers(cfg.auth.clash_secret)
+    return _clash_headers
+
+
+# Keep-alive pool shared by every controller call instead of a connect per request.
+clash_session = build_clash_session()
 
 
 def reload_clash() -> bool:
-    return reload_clash_config(
+    ok = reload_clash_config(
         config_file=cfg.paths.config_file,
         clash_api=cfg.auth.clash_api,
         clash_secret=cfg.auth.clash_secret,
         emit_log=emit_log,
         preferred_reload_path=cfg.runtime.clash_reload_path,
+        session=clash_session,
     )
+    # Every reload path (manual, merge+reload, restore, geo fallback) comes through
+    # here; a new config can change the proxy and group set, so drop the cached view.
+    clash_proxies_cache.clear()
+    return ok
 
 
 merge_service = MergeService(
@@ -85,10 +116,12 @@ merge_service = MergeService(
     schedule_lock=schedule_lock,
     history_lock=history_lock,
 )
+atexit.register(merge_service.flush_schedule_history)
 
 provider_service = ProviderService(
     clash_api=cfg.auth.clash_api,
     clash_headers=clash_headers,
+    session=clash_session,
     provider_recovery_file=cfg.script_paths.provider_recovery_file,
     provider_auto_refresh_enabled=cfg.provider.enabled,
     provider_recovery_check_interval=cfg.provider.check_interval,
@@ -122,19 +155,42 @@ kernel_service = KernelService(
 geo_service = GeoService(
     clash_api=cfg.auth.clash_api,
     clash_headers=clash_headers,
+    session=clash_session,
     system_proxy_names=set(cfg.constants.system_proxy_names),
 )
 
 
+_safe_name_fullmatch = cfg.constants.safe_name_pattern.fullmatch
+
+
 def ensure_safe_name(name: str) -> bool:
-    return bool(cfg.constants.safe_name_pattern.fullmatch(name))
+    return _safe_name_fullmatch(name) is not None
 
 
 def ensure_json_body():
-    body = request.get_json(silent=True)
+    # Action endpoints are mostly bodiless POSTs; skip the parse attempt for them.
+    # Handlers read the body once, so there is no need to keep the raw bytes.
+    if request.content_length == 0:
+        return {}
+    body = request.get_json(silent=True, cache=False)
     return body if isinstance(body, dict) else {}
 
 
+def request_text_arg(body: dict, name: str, default: str = "") -> str:
+    """JSON body field, falling back to the query string, stripped; `default` when empty."""
+    value = body.get(name) or request.args.get(name)
+    if type(value) is not str:
+        value = str(value or "")
+    return value.strip() or default
+
+
+def request_int_arg(body: dict, name: str, default: int, lo: int, hi: int) -> int:
+    value = body.get(name)
+    if value is None:
+        value = request.args.get(name)
+    return max(lo, min(hi, safe_int(value, default)))
+
+
 def parse_optional_bool(value):
     if isinstance(value, bool):
         return value
@@ -481,7 +537,7 @@ def sanitize_schedule_history_items(items) -> list[dict]:
 
 
 def load_schedule_history() -> list[dict]:
-    return merge_service.load_schedule_history()
+    return merge_service.read_schedule_history()
 
 
 def save_schedule_history(items: list[dict]) -> None:
@@ -678,22 +734,34 @@ def scheduler_loop() -> None:
     merge_service.scheduler_loop()
 
 
+@lru_cache(maxsize=256)
+def format_mtime(seconds: int) -> str:
+    return datetime.fromtimestamp(seconds).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def scan_dir_files(path: Path) -> dict[str, os.DirEntry]:
+    try:
+        with os.scandir(path) as it:
+            return {entry.name: entry for entry in it if entry.is_file()}
+    except OSError:
+        return {}
+
+
 @app.route("/api/subscriptions", methods=["GET"])
 def get_subscriptions():
     subs = list_subscriptions()
+    cached_entries = scan_dir_files(cfg.paths.subs_dir)
     result = []
     for sub in subs:
         item = dict(sub)
         name = str(item.get("name", "")).strip()
-        cache_file = cfg.paths.subs_dir / f"{name}.yaml"
-        item["cached"] = cache_file.exists()
-        if cache_file.exists():
-            parsed = load_yaml(cache_file, {"proxies": []})
+        entry = cached_entries.get(f"{name}.yaml")
+        item["cached"] = entry is not None
+        if entry is not None:
+            parsed = load_yaml(Path(entry.path), {"proxies": []})
             proxies = parsed.get("proxies", [])
             item["node_count"] = len(proxies) if isinstance(proxies, list) else 0
-            item["cached_time"] = datetime.fromtimestamp(cache_file.stat().st_mtime).strftime(
-                "%Y-%m-%d %H:%M:%S"
-            )
+            item["cached_time"] = format_mtime(int(entry.stat().st_mtime))
         else:
             item["node_count"] = 0
             item["cached_time"] = None
@@ -731,31 +799,45 @@ def put_subscription_sets():
 
 @app.route("/api/schedule", methods=["GET"])
 def get_schedule():
-    with schedule_lock:
-        data = load_schedule()
+    # save_json replaces the file atomically, so readers don't need schedule_lock.
+    data = load_schedule()
     return jsonify({"success": True, "data": data})
 
 
+def apply_schedule_update(current: dict, body: dict) -> dict:
+    updated = dict(current)
+    old_enabled = bool(current.get("enabled", False))
+    old_interval = int(current.get("interval_minutes", 60))
+    updated["enabled"] = bool(body.get("enabled", current["enabled"]))
+    if "interval_minutes" in body:
+        updated["interval_minutes"] = body.get("interval_minutes")
+    updated = sanitize_schedule(updated)
+    enabled_changed = updated["enabled"] != old_enabled
+    interval_changed = updated["interval_minutes"] != old_interval
+    if updated["enabled"] and (enabled_changed or interval_changed or not updated.get("next_run")):
+        # Keep scheduler behavior intuitive: changing interval/enabled should recalculate next run.
+        updated["next_run"] = add_minutes_iso(updated["interval_minutes"])
+    if not updated["enabled"]:
+        updated["next_run"] = None
+    return updated
+
+
 @app.route("/api/schedule", methods=["PUT"])
 @require_write_auth
 def put_schedule():
     body = ensure_json_body()
-    with schedule_lock:
-        current = load_schedule()
-        old_enabled = bool(current.get("enabled", False))
-        old_interval = int(current.get("interval_minutes", 60))
-        current["enabled"] = bool(body.get("enabled", current["enabled"]))
-        if "interval_minutes" in body:
-            current["interval_minutes"] = body.get("interval_minutes")
-        current = sanitize_schedule(current)
-        enabled_changed = current["enabled"] != old_enabled
-        interval_changed = current["interval_minutes"] != old_interval
-        if current["enabled"] and (enabled_changed or interval_changed or not current.get("next_run")):
-            # Keep scheduler behavior intuitive: changing interval/enabled should recalculate next run.
-            current["next_run"] = add_minutes_iso(current["interval_minutes"])
-        if not current["enabled"]:
-            current["next_run"] = None
-        saved = save_schedule(current)
+    saved = None
+    # Optimistic update: compute outside the lock, then compare-and-save under it.
+    for _ in range(3):
+        before = load_schedule()
+        updated = apply_schedule_update(before, body)
+        with schedule_lock:
+            if load_schedule() == before:
+                saved = save_schedule(updated)
+                break
+    if saved is None:
+        with schedule_lock:
+            saved = save_schedule(apply_schedule_update(load_schedule(), body))
     emit_log(
         f"schedule updated: enabled={saved['enabled']} interval={saved['interval_minutes']}m"
     )
@@ -766,7 +848,8 @@ def put_schedule():
 def get_schedule_history():
     with history_lock:
         items = load_schedule_history()
-    items = list(reversed(items))
+    # Freshly loaded and not shared, so reverse in place instead of copying.
+    items.reverse()
     return jsonify({"success": True, "data": items})
 
 
@@ -799,7 +882,7 @@ def add_subscription():
         "url": url,
         "enabled": bool(body.get("enabled", True)),
         "prefix": str(body.get("prefix", "")),
-        "exclude_filter": str(body.get("exclude_filter", "(?i)(expired|官网|剩余|流量)")),
+        "exclude_filter": str(body.get("exclude_filter", cfg.constants.default_exclude_filter)),
         "include_filter": str(body.get("include_filter", "")),
     }
     subs.append(new_item)
@@ -878,6 +961,49 @@ def toggle_subscription(name):
     return json_error("not found", 404)
 
 
+SUBSCRIPTION_SCAN_THRESHOLD = 256 * 1024
+_SUB_PROXIES_HEADER_RE = re.compile(r"^proxies:[ \t]*(?:#.*)?$", re.MULTILINE)
+_SUB_TOP_LEVEL_KEY_RE = re.compile(r"^[^\s#-][^\n]*:", re.MULTILINE)
+_SUB_PROXY_ITEM_RE = re.compile(r"^([ \t]*)-[ \t]", re.MULTILINE)
+_SUB_PROXY_NAME_RE = re.compile(r"(?<![\w-])name:[ \t]*['\"]?([^'\"\n,}]+)")
+
+
+def scan_subscription_proxies(text: str, sample_size: int = 10) -> tuple[int, list[str]] | None:
+    """Count block-style `proxies:` items without building a YAML tree.
+
+    Returns None when the payload does not look like a block sequence so the
+    caller can fall back to a full parse.
+    """
+    header = _SUB_PROXIES_HEADER_RE.search(text)
+    if not header:
+        return None
+    section_start = header.end()
+    next_key = _SUB_TOP_LEVEL_KEY_RE.search(text, section_start)
+    section_end = next_key.start() if next_key else len(text)
+
+    item_indent = None
+    count = 0
+    starts: list[int] = []
+    for match in _SUB_PROXY_ITEM_RE.finditer(text, section_start, section_end):
+        indent = match.group(1)
+        if item_indent is None:
+            item_indent = indent
+        elif indent != item_indent:
+            continue
+        count += 1
+        if len(starts) <= sample_size:
+            starts.append(match.end())
+    if item_indent is None:
+        return None
+
+    starts.append(section_end)
+    sample: list[str] = []
+    for idx in range(min(sample_size, count)):
+        found = _SUB_PROXY_NAME_RE.search(text, starts[idx], starts[idx + 1])
+        sample.append(found.group(1).strip() if found else "?")
+    return count, sample
+
+
 @app.route("/api/subscriptions/<name>/test", methods=["POST"])
 @require_write_auth
 def test_subscription(name):
@@ -894,17 +1020,25 @@ def test_subscription(name):
             timeout=15,
         )
         resp.raise_for_status()
-        parsed = yaml.safe_load(resp.text) or {}
-        proxies = parsed.get("proxies", []) if isinstance(parsed, dict) else []
-        sample = []
-        if isinstance(proxies, list):
-            sample = [str(item.get("name", "?")) for item in proxies[:10] if isinstance(item, dict)]
+        text = resp.text
+        # Large feeds only need a count and a few names; skip building the full YAML tree.
+        scanned = scan_subscription_proxies(text) if len(resp.content) > SUBSCRIPTION_SCAN_THRESHOLD else None
+        if scanned is not None:
+            node_count, sample = scanned
+        else:
+            parsed = parse_yaml(text) or {}
+            proxies = parsed.get("proxies", []) if isinstance(parsed, dict) else []
+            sample = []
+            node_count = 0
+            if isinstance(proxies, list):
+                sample = [str(item.get("name", "?")) for item in proxies[:10] if isinstance(item, dict)]
+                node_count = len(proxies)
         return jsonify(
             {
                 "success": True,
-                "node_count": len(proxies) if isinstance(proxies, list) else 0,
+                "node_count": node_count,
                 "sample_nodes": sample,
-                "response_size": len(resp.text),
+                "response_size": len(text),
             }
         )
     except Exception as exc:
@@ -940,27 +1074,33 @@ def merge_and_reload():
     return jsonify({"success": True, "message": "merge+reload launched"})
 
 
+# Dashboards poll status every few seconds; serve repeats from memory.
+clash_status_cache = TtlCache(2.0)
+
+
 @app.route("/api/clash/status", methods=["GET"])
 def clash_status():
-    try:
-        resp = requests.get(cfg.auth.clash_api, headers=clash_headers(), timeout=3)
-        info = resp.json()
-        return jsonify(
-            {
+    data = clash_status_cache.get()
+    if data is None:
+        try:
+            resp = clash_session.get(cfg.auth.clash_api, headers=clash_headers(), timeout=3)
+            info = resp.json()
+            data = {
                 "success": True,
                 "running": True,
                 "version": info.get("version", "unknown"),
                 "mode": info.get("mode", "unknown"),
             }
-        )
-    except Exception:
-        return jsonify({"success": True, "running": False})
+        except Exception:
+            data = {"success": True, "running": False}
+        clash_status_cache.set(data)
+    return jsonify(data)
 
 
 @app.route("/api/clash/traffic", methods=["GET"])
 def clash_traffic():
     try:
-        resp = requests.get(
+        resp = clash_session.get(
             f"{cfg.auth.clash_api}/traffic",
             headers=clash_headers(),
             timeout=(3, 3),
@@ -971,60 +1111,29 @@ def clash_traffic():
 
         payload = {}
         # Some runtimes expose /traffic as a streaming endpoint (JSON lines).
-        # Read the first non-empty line and parse it as the current snapshot.
+        # Read the first non-empty line straight off the socket and parse it
+        # as the current snapshot; iter_lines(chunk_size=1) adds per-byte
+        # overhead and needed a second request when it did not yield promptly.
         try:
-            for line in resp.iter_lines(chunk_size=1, decode_unicode=True):
-                line_text = str(line or "").strip()
-                if not line_text:
+            for _ in range(3):
+                raw_line = resp.raw.readline(8192).strip()
+                if not raw_line:
                     continue
-                loaded = json.loads(line_text)
+                loaded = json.loads(raw_line)
                 if isinstance(loaded, dict):
                     payload = loaded
                 break
         finally:
             resp.close()
 
-        if not payload:
-            # Fallback for adapters that do not yield promptly via iter_lines.
-            resp2 = requests.get(
-                f"{cfg.auth.clash_api}/traffic",
-                headers=clash_headers(),
-                timeout=(3, 3),
-                stream=True,
-            )
-            try:
-                raw_line = resp2.raw.readline()
-                if isinstance(raw_line, bytes):
-                    line_text = raw_line.decode("utf-8", errors="ignore").strip()
-                else:
-                    line_text = str(raw_line or "").strip()
-                if line_text:
-                    loaded = json.loads(line_text)
-                    if isinstance(loaded, dict):
-                        payload = loaded
-            finally:
-                resp2.close()
-
         raw_speed_up = payload.get("up", 0)
         raw_speed_down = payload.get("down", 0)
         raw_total_up = payload.get("upTotal", raw_speed_up)
         raw_total_down = payload.get("downTotal", raw_speed_down)
-        try:
-            speed_up = max(0, int(raw_speed_up))
-        except Exception:
-            speed_up = 0
-        try:
-            speed_down = max(0, int(raw_speed_down))
-        except Exception:
-            speed_down = 0
-        try:
-            total_up = max(0, int(raw_total_up))
-        except Exception:
-            total_up = 0
-        try:
-            total_down = max(0, int(raw_total_down))
-        except Exception:
-            total_down = 0
+        speed_up = max(0, safe_int(raw_speed_up))
+        speed_down = max(0, safe_int(raw_speed_down))
+        total_up = max(0, safe_int(raw_total_up))
+        total_down = max(0, safe_int(raw_total_down))
 
         return jsonify(
             {
@@ -1048,13 +1157,11 @@ def clash_traffic():
 @app.route("/api/clash/config", methods=["GET"])
 def get_clash_config():
     try:
-        resp = requests.get(f"{cfg.auth.clash_api}/configs", headers=clash_headers(), timeout=5)
+        resp = clash_session.get(f"{cfg.auth.clash_api}/configs", headers=clash_headers(), timeout=5)
         if resp.status_code != 200:
             return json_error(f"clash api error: {resp.status_code}", 502)
 
-        payload = resp.json() if resp.content else {}
-        if not isinstance(payload, dict):
-            payload = {}
+        payload = as_dict(resp.json() if resp.content else {})
 
         mode = str(payload.get("mode", "rule")).strip().lower() or "rule"
         if mode not in {"rule", "global", "direct"}:
@@ -1148,6 +1255,7 @@ def put_clash_config():
         if resp.status_code not in (200, 204):
             return json_error(f"clash api error: {resp.status_code}", 502)
 
+        clash_status_cache.clear()
         emit_log(f"clash config updated: {', '.join(changed_items)}")
         return jsonify({"success": True, "data": payload})
     except Exception as exc:
@@ -1155,7 +1263,7 @@ def put_clash_config():
 
 
 def _apply_clash_config_patch(payload: dict, timeout: float = 5):
-    resp = requests.patch(
+    resp = clash_session.patch(
         f"{cfg.auth.clash_api}/configs",
         headers=clash_headers(),
         json=payload,
@@ -1163,7 +1271,7 @@ def _apply_clash_config_patch(payload: dict, timeout: float = 5):
     )
     if resp.status_code not in (200, 204) and resp.status_code in (404, 405, 501):
         # Compatibility fallback for runtimes that only accept PUT /configs.
-        resp = requests.put(
+        resp = clash_session.put(
             f"{cfg.auth.clash_api}/configs",
             headers=clash_headers(),
             json=payload,
@@ -1233,6 +1341,13 @@ def _update_rule_providers() -> dict:
     return geo_service.update_rule_providers()
 
 
+def _run_geo_updates(*, update_geo_db: bool, update_rule_providers: bool) -> tuple[dict, dict]:
+    return geo_service.run_geo_updates(
+        update_geo_db=update_geo_db,
+        update_rule_providers=update_rule_providers,
+    )
+
+
 def _compose_geo_update_result(
     check_result: dict,
     geo_db_result: dict,
@@ -1250,6 +1365,28 @@ def _compose_geo_update_result(
     )
 
 
+# Digest per backup label of content that is already safe: either the last
+# file backed up or the last file written by the same handler. Repeated
+# fallback writes then keep one backup of the original file instead of one
+# per toggle.
+_backup_hashes: dict[str, str] = {}
+
+
+def file_digest(path: Path) -> str:
+    try:
+        return hashlib.sha1(path.read_bytes()).hexdigest()
+    except OSError:
+        return ""
+
+
+def make_backup_if_changed(path: Path, label: str) -> None:
+    digest = file_digest(path)
+    if not digest or _backup_hashes.get(label) == digest:
+        return
+    make_backup(path, label)
+    _backup_hashes[label] = digest
+
+
 @app.route("/api/clash/geo/settings", methods=["PUT"])
 @require_write_auth
 def put_geo_settings():
@@ -1283,7 +1420,7 @@ def put_geo_settings():
             return json_error(f"clash api error: {resp.status_code}", 502)
 
         # Read back runtime value. Some cores acknowledge but don't apply these fields dynamically.
-        verify_resp = requests.get(f"{cfg.auth.clash_api}/configs", headers=clash_headers(), timeout=5)
+        verify_resp = clash_session.get(f"{cfg.auth.clash_api}/configs", headers=clash_headers(), timeout=5)
         runtime_applied = False
         runtime_values: dict = {}
         if verify_resp.status_code == 200:
@@ -1313,8 +1450,9 @@ def put_geo_settings():
             if not isinstance(config_payload, dict):
                 config_payload = {}
             config_payload.update(payload)
-            make_backup(cfg.paths.config_file, "geo_settings")
+            make_backup_if_changed(cfg.paths.config_file, "geo_settings")
             save_yaml(cfg.paths.config_file, config_payload)
+            _backup_hashes["geo_settings"] = file_digest(cfg.paths.config_file)
             reloaded = reload_clash()
             applied_via = "config_reload"
             if not reloaded:
@@ -1338,12 +1476,10 @@ def put_geo_settings():
 @app.route("/api/clash/geo/status", methods=["GET"])
 def clash_geo_status():
     try:
-        config_resp = requests.get(f"{cfg.auth.clash_api}/configs", headers=clash_headers(), timeout=6)
+        config_resp = clash_session.get(f"{cfg.auth.clash_api}/configs", headers=clash_headers(), timeout=6)
         if config_resp.status_code != 200:
             return json_error(f"clash api error: {config_resp.status_code}", 502)
-        config_payload = config_resp.json() if config_resp.content else {}
-        if not isinstance(config_payload, dict):
-            config_payload = {}
+        config_payload = as_dict(config_resp.json() if config_resp.content else {})
     except Exception as exc:
         return json_error(f"failed to load clash config: {exc}", 500)
 
@@ -1355,11 +1491,7 @@ def clash_geo_status():
     if geodata_mode is None:
         geodata_mode = False
 
-    interval_raw = config_payload.get("geo-update-interval", 24)
-    try:
-        geo_update_interval = max(1, int(interval_raw))
-    except Exception:
-        geo_update_interval = 24
+    geo_update_interval = max(1, safe_int(config_payload.get("geo-update-interval", 24), 24))
 
     rows, rows_error = _fetch_rule_provider_rows()
 
@@ -1382,18 +1514,19 @@ def clash_geo_status():
     )
 
 
+# Recent successful proxy checks, keyed by test URL. A GEO update right after a
+# manual check (or a double click) reuses the result instead of probing again;
+# failures are never cached so the update still aborts fast on a broken proxy.
+geo_check_cache = TtlCache(10.0)
+
+
 @app.route("/api/clash/geo/check", methods=["GET"])
 def clash_geo_check():
-    timeout_raw = request.args.get("timeout", 6000)
-    try:
-        timeout_ms = int(timeout_raw)
-    except Exception:
-        timeout_ms = 6000
-    timeout_ms = max(1000, min(20000, timeout_ms))
-    test_url = str(request.args.get("url") or "http://www.gstatic.com/generate_204").strip()
-    if not test_url:
-        test_url = "http://www.gstatic.com/generate_204"
+    timeout_ms = request_int_arg({}, "timeout", 6000, 1000, 20000)
+    test_url = request_text_arg({}, "url", "http://www.gstatic.com/generate_204")
     result = _geo_proxy_check(test_url=test_url, timeout_ms=timeout_ms)
+    if result.get("ok"):
+        geo_check_cache.set(result, key=test_url)
     return jsonify({"success": True, "data": result})
 
 
@@ -1411,14 +1544,21 @@ def action_geo_update():
     if update_rule_providers is None:
         update_rule_providers = True
 
+    test_url = "http://www.gstatic.com/generate_204"
     check_result = {
         "ok": True,
         "message": "skipped",
-        "tested_url": "http://www.gstatic.com/generate_204",
+        "tested_url": test_url,
         "attempts": [],
     }
     if check_proxy:
-        check_result = _geo_proxy_check()
+        cached = geo_check_cache.get(key=test_url)
+        if cached is not None:
+            check_result = cached
+        else:
+            check_result = _geo_proxy_check(test_url=test_url)
+            if check_result.get("ok"):
+                geo_check_cache.set(check_result, key=test_url)
 
     if check_proxy and not bool(check_result.get("ok")):
         cancel_message = "代理连通性检查未通过，已取消 GEO 更新"
@@ -1458,13 +1598,9 @@ def action_geo_update():
             }
         )
 
-    geo_db_result = (
-        _perform_geo_db_update()
-        if update_geo_db
-        else {"status": "skipped", "message": "not requested", "new_data": "unknown"}
-    )
-    provider_result = (
-        _update_rule_providers() if update_rule_providers else _empty_rule_provider_update_result()
+    geo_db_result, provider_result = _run_geo_updates(
+        update_geo_db=update_geo_db,
+        update_rule_providers=update_rule_providers,
     )
 
     result = _compose_geo_update_result(
@@ -1498,12 +1634,27 @@ def action_geo_update():
     return jsonify({"success": True, "data": result})
 
 
+# Groups and proxy-meta both read the full /proxies payload; share one fetch
+# between them and across quick UI refreshes. Treat the result as read-only.
+clash_proxies_cache = TtlCache(1.5)
+
+
+def fetch_clash_proxies() -> tuple[dict, int]:
+    proxies = clash_proxies_cache.get()
+    if proxies is not None:
+        return proxies, 200
+    resp = clash_session.get(f"{cfg.auth.clash_api}/proxies", headers=clash_headers(), timeout=6)
+    if resp.status_code != 200:
+        return {}, resp.status_code
+    proxies = as_dict(as_dict(resp.json() if resp.content else {}).get("proxies"))
+    clash_proxies_cache.set(proxies)
+    return proxies, 200
+
+
 @app.route("/api/clash/groups", methods=["GET"])
 def clash_groups():
     try:
-        resp = requests.get(f"{cfg.auth.clash_api}/proxies", headers=clash_headers(), timeout=5)
-        data = resp.json()
-        proxies = data.get("proxies", {})
+        proxies, _ = fetch_clash_proxies()
         groups = []
         for group_name, item in proxies.items():
             if not isinstance(item, dict):
@@ -1529,14 +1680,9 @@ def clash_groups():
 @app.route("/api/clash/proxy-meta", methods=["GET"])
 def clash_proxy_meta():
     try:
-        resp = requests.get(f"{cfg.auth.clash_api}/proxies", headers=clash_headers(), timeout=6)
-        if resp.status_code != 200:
-            return json_error(f"clash api error: {resp.status_code}", 502)
-
-        payload = resp.json() if resp.content else {}
-        proxies = payload.get("proxies", {}) if isinstance(payload, dict) else {}
-        if not isinstance(proxies, dict):
-            proxies = {}
+        proxies, status_code = fetch_clash_proxies()
+        if status_code != 200:
+            return json_error(f"clash api error: {status_code}", 502)
 
         mapping: dict[str, str] = {}
         for proxy_name, item in proxies.items():
@@ -1564,31 +1710,17 @@ def clash_proxy_providers():
 @app.route("/api/clash/proxies/delay", methods=["GET", "POST"])
 def clash_proxy_delay():
     body = ensure_json_body()
-    proxy_name = str(body.get("name") or request.args.get("name", "")).strip()
+    proxy_name = request_text_arg(body, "name")
     if not proxy_name:
         return json_error("name is required", 400)
 
-    test_url = str(
-        body.get("url")
-        or request.args.get("url")
-        or "http://www.gstatic.com/generate_204"
-    ).strip()
-    if not test_url:
-        test_url = "http://www.gstatic.com/generate_204"
-
-    timeout_ms = body.get("timeout")
-    if timeout_ms is None:
-        timeout_ms = request.args.get("timeout", 6000)
-    try:
-        timeout_ms = int(timeout_ms)
-    except Exception:
-        timeout_ms = 6000
-    timeout_ms = max(1000, min(20000, timeout_ms))
+    test_url = request_text_arg(body, "url", "http://www.gstatic.com/generate_204")
+    timeout_ms = request_int_arg(body, "timeout", 6000, 1000, 20000)
 
     encoded = quote(proxy_name, safe="")
     request_timeout = max(3.0, timeout_ms / 1000.0 + 2.0)
     try:
-        resp = requests.get(
+        resp = clash_session.get(
             f"{cfg.auth.clash_api}/proxies/{encoded}/delay",
             headers=clash_headers(),
             params={"url": test_url, "timeout": timeout_ms},
@@ -1597,14 +1729,8 @@ def clash_proxy_delay():
         if resp.status_code != 200:
             return json_error(f"clash api error: {resp.status_code}", 502)
 
-        data = resp.json() if resp.content else {}
-        delay = data.get("delay", None) if isinstance(data, dict) else None
-        delay_ms = -1
-        if delay is not None:
-            try:
-                delay_ms = int(delay)
-            except Exception:
-                delay_ms = -1
+        data = as_dict(resp.json() if resp.content else {})
+        delay_ms = safe_int(data.get("delay"), -1)
 
         return jsonify(
             {
@@ -1628,7 +1754,7 @@ def clash_group_select(group_name):
         return json_error("name is required", 400)
     encoded = quote(group_name, safe="")
     try:
-        resp = requests.put(
+        resp = clash_session.put(
             f"{cfg.auth.clash_api}/proxies/{encoded}",
             headers=clash_headers(),
             json={"name": target},
@@ -1636,15 +1762,33 @@ def clash_group_select(group_name):
         )
         if resp.status_code not in (200, 204):
             return json_error(f"clash api error: {resp.status_code}", 502)
+        clash_proxies_cache.clear()
         emit_log(f"group switched: {group_name} -> {target}")
         return jsonify({"success": True})
     except Exception as exc:
         return json_error(str(exc), 500)
 
 
+def file_content_response(path: Path, extra: dict | None = None):
+    """Return the file body as JSON, or 304 when the client's ETag still matches."""
+    try:
+        st = path.stat()
+        etag = f"{st.st_mtime_ns:x}-{st.st_size:x}"
+    except OSError:
+        etag = ""
+    if etag and request.if_none_match.contains_weak(etag):
+        resp = Response(status=304)
+    else:
+        resp = jsonify({"success": True, **(extra or {}), "content": read_text(path)})
+    if etag:
+        resp.set_etag(etag)
+        resp.headers["Cache-Control"] = "no-cache"
+    return resp
+
+
 @app.route("/api/override", methods=["GET"])
 def get_override():
-    return jsonify({"success": True, "content": read_text(cfg.script_paths.override_file)})
+    return file_content_response(cfg.script_paths.override_file)
 
 
 @app.route("/api/override", methods=["PUT"])
@@ -1653,18 +1797,19 @@ def put_override():
     body = ensure_json_body()
     content = str(body.get("content", ""))
     try:
-        yaml.safe_load(content)
+        parse_yaml(content)
     except yaml.YAMLError as exc:
         return json_error(f"yaml error: {exc}", 400)
     make_backup(cfg.script_paths.override_file, "override")
     write_text(cfg.script_paths.override_file, content)
+    files_listing_cache.clear()
     emit_log("override.yaml updated")
     return jsonify({"success": True})
 
 
 @app.route("/api/override-script", methods=["GET"])
 def get_override_script():
-    return jsonify({"success": True, "content": read_text(cfg.script_paths.override_script_file)})
+    return file_content_response(cfg.script_paths.override_script_file)
 
 
 @app.route("/api/override-script", methods=["PUT"])
@@ -1677,13 +1822,14 @@ def put_override_script():
         return json_error(f"javascript error: {reason}", 400)
     make_backup(cfg.script_paths.override_script_file, "override_js")
     write_text(cfg.script_paths.override_script_file, content)
+    files_listing_cache.clear()
     emit_log("override.js updated")
     return jsonify({"success": True})
 
 
 @app.route("/api/site-policy", methods=["GET"])
 def get_site_policy():
-    return jsonify({"success": True, "content": read_text(cfg.script_paths.site_policy_file)})
+    return file_content_response(cfg.script_paths.site_policy_file)
 
 
 @app.route("/api/site-policy", methods=["PUT"])
@@ -1692,20 +1838,21 @@ def put_site_policy():
     body = ensure_json_body()
     content = str(body.get("content", ""))
     try:
-        parsed = yaml.safe_load(content) or {}
+        parsed = parse_yaml(content) or {}
         if not isinstance(parsed, dict):
             return json_error("site policy must be yaml object", 400)
     except yaml.YAMLError as exc:
         return json_error(f"yaml error: {exc}", 400)
     make_backup(cfg.script_paths.site_policy_file, "site_policy")
     write_text(cfg.script_paths.site_policy_file, content)
+    files_listing_cache.clear()
     emit_log("site_policy.yaml updated")
     return jsonify({"success": True})
 
 
 @app.route("/api/template", methods=["GET"])
 def get_template():
-    return jsonify({"success": True, "content": read_text(cfg.script_paths.template_file)})
+    return file_content_response(cfg.script_paths.template_file)
 
 
 @app.route("/api/template", methods=["PUT"])
@@ -1714,18 +1861,19 @@ def put_template():
     body = ensure_json_body()
     content = str(body.get("content", ""))
     try:
-        yaml.safe_load(content)
+        parse_yaml(content)
     except yaml.YAMLError as exc:
         return json_error(f"yaml error: {exc}", 400)
     make_backup(cfg.script_paths.template_file, "template")
     write_text(cfg.script_paths.template_file, content)
+    files_listing_cache.clear()
     emit_log("template.yaml updated")
     return jsonify({"success": True})
 
 
 @app.route("/api/merge-script", methods=["GET"])
 def get_merge_script():
-    return jsonify({"success": True, "content": read_text(cfg.script_paths.merge_script_file)})
+    return file_content_response(cfg.script_paths.merge_script_file)
 
 
 @app.route("/api/merge-script", methods=["PUT"])
@@ -1739,13 +1887,14 @@ def put_merge_script():
         return json_error(f"python error: {exc}", 400)
     make_backup(cfg.script_paths.merge_script_file, "merge")
     write_text(cfg.script_paths.merge_script_file, content)
+    files_listing_cache.clear()
     emit_log("merge.py updated")
     return jsonify({"success": True})
 
 
 @app.route("/api/config", methods=["GET"])
 def get_config():
-    return jsonify({"success": True, "content": read_text(cfg.paths.config_file)})
+    return file_content_response(cfg.paths.config_file)
 
 
 EDITABLE_FILES = {
@@ -1762,21 +1911,31 @@ EDITABLE_FILES = {
 }
 
 
+# Merge runs and the scheduler also touch these files, so rely on a short
+# TTL for those; the editor endpoints and backup restore clear it directly.
+files_listing_cache = TtlCache(0.5)
+
+
 @app.route("/api/files", methods=["GET"])
 def list_files():
-    data = []
-    for key, path in EDITABLE_FILES.items():
-        data.append(
-            {
-                "key": key,
-                "path": str(path),
-                "exists": path.exists(),
-                "size": path.stat().st_size if path.exists() else 0,
-                "modified": datetime.fromtimestamp(path.stat().st_mtime).strftime("%Y-%m-%d %H:%M:%S")
-                if path.exists()
-                else None,
-            }
-        )
+    data = files_listing_cache.get()
+    if data is None:
+        data = []
+        for key, path in EDITABLE_FILES.items():
+            try:
+                st = path.stat()
+            except OSError:
+                st = None
+            data.append(
+                {
+                    "key": key,
+                    "path": str(path),
+                    "exists": st is not None,
+                    "size": st.st_size if st is not None else 0,
+                    "modified": format_mtime(int(st.st_mtime)) if st is not None else None,
+                }
+            )
+        files_listing_cache.set(data)
     return jsonify({"success": True, "data": data})
 
 
@@ -1785,7 +1944,7 @@ def get_file(key):
     path = EDITABLE_FILES.get(key)
     if not path:
         return json_error("unknown key", 404)
-    return jsonify({"success": True, "path": str(path), "content": read_text(path)})
+    return file_content_response(path, {"path": str(path)})
 
 
 @app.route("/api/files/<key>", methods=["PUT"])
@@ -1800,7 +1959,7 @@ def put_file(key):
     suffix = path.suffix.lower()
     try:
         if suffix in (".yaml", ".yml"):
-            yaml.safe_load(content)
+            parse_yaml(content)
         elif suffix == ".json":
             json.loads(content)
         elif suffix == ".py":
@@ -1814,6 +1973,7 @@ def put_file(key):
 
     make_backup(path, key)
     write_text(path, content)
+    files_listing_cache.clear()
     emit_log(f"file updated: {key}")
     return jsonify({"success": True})
 
@@ -1824,19 +1984,22 @@ def get_logs():
     return jsonify({"success": True, "data": items})
 
 
+LOG_STREAM_PING_SECONDS = 10
+
+
 @app.route("/api/logs/stream", methods=["GET"])
 def log_stream():
+    # Each open stream holds a gunicorn thread that only notices a gone client
+    # when it next writes, so keep-alive pings double as the release interval.
     def generate():
         q, history = subscribe_log_queue(maxsize=128, history_limit=30)
         try:
-            for item in history:
-                yield f"data: {json.dumps(item, ensure_ascii=False)}\n\n"
+            yield from history
             while True:
                 try:
-                    item = q.get(timeout=25)
-                    yield f"data: {json.dumps(item, ensure_ascii=False)}\n\n"
+                    yield q.get(timeout=LOG_STREAM_PING_SECONDS)
                 except queue.Empty:
-                    yield ": ping\n\n"
+                    yield b": ping\n\n"
         finally:
             unsubscribe_log_queue(q)
 
@@ -1854,14 +2017,17 @@ def log_stream():
 def backups():
     cfg.paths.backup_dir.mkdir(parents=True, exist_ok=True)
     rows = []
-    for item in sorted(cfg.paths.backup_dir.glob("*"), reverse=True):
-        if not item.is_file():
+    entries = scan_dir_files(cfg.paths.backup_dir)
+    for name in sorted(entries, reverse=True):
+        try:
+            st = entries[name].stat()
+        except OSError:
             continue
         rows.append(
             {
-                "name": item.name,
-                "size": item.stat().st_size,
-                "time": datetime.fromtimestamp(item.stat().st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
+                "name": name,
+                "size": st.st_size,
+                "time": format_mtime(int(st.st_mtime)),
             }
         )
     return jsonify({"success": True, "data": rows})
@@ -1887,7 +2053,8 @@ def restore_backup(name):
     backup_file = cfg.paths.backup_dir / name
     if not backup_file.exists() or not backup_file.is_file():
         return json_error("backup not found", 404)
-    shutil.copy2(backup_file, cfg.paths.config_file)
+    copy_file(backup_file, cfg.paths.config_file)
+    files_listing_cache.clear()
     ok = reload_clash()
     emit_log(f"backup restored: {name} (reload={ok})")
     return jsonify({"success": True, "reloaded": ok})
@@ -1954,6 +2121,7 @@ def bootstrap_files():
 # ==================== Proxy Records ====================
 
 proxy_record_store = ProxyRecordStore(cfg.script_paths.proxy_records_file, max_records=cfg.connection_record.max_records)
+atexit.register(proxy_record_store.flush)
 connection_recorder: ClashConnectionRecorder | None = None
 
 
@@ -2056,6 +2224,7 @@ def get_proxy_recorder_status():
         "enabled": cfg.connection_record.enabled,
         "running": False,
         "poll_interval": cfg.connection_record.interval,
+        "effective_poll_interval": cfg.connection_record.interval,
         "active_connections": 0,
     }
     if connection_recorder is not None:
@@ -2114,6 +2283,8 @@ def start_runtime_services() -> None:
                 emit_log=emit_log,
                 poll_interval=cfg.connection_record.interval,
                 request_timeout=5,
+                session=clash_session,
+                idle_backoff=cfg.connection_record.idle_backoff,
             )
             connection_recorder.start()
             emit_log(
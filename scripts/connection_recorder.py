@@ -2,24 +2,39 @@
 from __future__ import annotations
 
 import hashlib
+import heapq
 import json
+import os
 import threading
 import time
-from collections import Counter
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, Callable, Sequence
 
 import requests
 
+# get_stats counts timestamps per quarter hour, then maps each bucket to a local
+# date; UTC offsets are whole quarter hours, so a bucket never spans two days.
+QUARTER_HOUR_SECONDS = 900
+
+# The records file is machine-read, so it is written compactly; reusing one
+# encoder avoids building a JSONEncoder for every json.dumps() call.
+_encode_json = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
 
 def _safe_str(value: Any) -> str:
+    # Called for every field of every connection; skip str() for the common cases.
+    if type(value) is str:
+        return value.strip()
     if value is None:
         return ""
     return str(value).strip()
 
 
 def _safe_int(value: Any, default: int = 0) -> int:
+    if type(value) is int:
+        return value
     try:
         return int(value)
     except Exception:
@@ -37,49 +52,279 @@ def _safe_list_of_str(value: Any) -> list[str]:
     return result
 
 
+def _hash_text(parts: list[str]) -> str:
+    # merge_key is persisted with the records, so it has to stay a stable digest.
+    raw = "|".join(parts)
+    return hashlib.sha1(raw.encode("utf-8", errors="ignore")).hexdigest()
+
+
+_STRING_FIELDS = (
+    "id",
+    "type",
+    "proxy_name",
+    "group_name",
+    "target_node",
+    "subscription",
+    "provider",
+    "note",
+    "app_name",
+    "process_path",
+    "host",
+    "destination",
+    "rule",
+    "rule_payload",
+    "network",
+    "conn_type",
+    "merge_key",
+)
+
+_SEARCH_FIELDS = (
+    "proxy_name",
+    "group_name",
+    "target_node",
+    "app_name",
+    "process_path",
+    "host",
+    "destination",
+    "rule",
+)
+
+
+# Connection fields that a newer event overrides when it has a value.
+_MERGED_FIELDS = (
+    "group_name",
+    "target_node",
+    "app_name",
+    "process_path",
+    "host",
+    "destination",
+    "rule",
+    "rule_payload",
+    "network",
+    "conn_type",
+    "merge_key",
+)
+
+
+def _search_text(record: dict) -> str:
+    # Fields are NUL-separated so a keyword cannot match across two of them.
+    return "\x00".join([record[field] for field in _SEARCH_FIELDS]).lower()
+
+
+_record_timestamp = itemgetter("timestamp")
+
+
+def _normalize_record(record: dict) -> dict:
+    # Records built here already hold stripped strings and an int timestamp;
+    # ones read from disk are coerced once so the rest of the store can trust
+    # the shape without re-checking it.
+    for field in _STRING_FIELDS:
+        record[field] = _safe_str(record.get(field))
+    record["timestamp"] = _safe_int(record.get("timestamp"), 0)
+    return record
+
+
 class ProxyRecordStore:
+    # The file is an append-only JSON Lines log ({"op": "upsert" | "delete" | "clear", ...});
+    # records live in memory and the log is compacted once it grows past
+    # compact_factor * max_records lines.
+    compact_factor = 8
+    # Connection merges mostly bump counters, so their upserts are buffered
+    # per record id and appended in batches.
+    flush_size = 32
+    flush_interval = 5.0
+
     def __init__(self, file_path: Path, max_records: int = 1000) -> None:
         self.file_path = Path(file_path)
         self.max_records = max(100, _safe_int(max_records, 1000))
-        self.lock = threading.Lock()
+        # Writers serialize on _write_lock and publish a new _records tuple
+        # (copying any record they modify), so readers just take a reference.
+        self._write_lock = threading.Lock()
+        self._records: tuple[dict, ...] | None = None
+        self._loaded_mtime_ns = 0
+        # merge_key -> record; holding the dict itself keeps the index valid
+        # when records are deleted or trimmed without renumbering positions.
+        self._index_by_key: dict[str, dict] = {}
+        # record id -> lowercased keyword search text (see _search_text).
+        self._search_texts: dict[str, str] = {}
+        self._log_lines = 0
+        self._needs_compact = False
+        # Digest of the file as last written by _compact_unlocked (None once appended to).
+        self._file_digest: bytes | None = None
+        self._pending: dict[str, dict] = {}
+        self._last_flush = 0.0
+        self._seq = 0
 
     def ensure_file(self) -> None:
-        with self.lock:
-            if self.file_path.exists():
-                return
-            self._save_unlocked({"records": [], "version": 1})
+        with self._write_lock:
+            self._get_records()
+            if self._needs_compact or not self.file_path.exists():
+                self._compact_unlocked()
+
+    def _file_mtime_ns(self) -> int:
+        try:
+            return self.file_path.stat().st_mtime_ns
+        except OSError:
+            return 0
 
-    def _load_unlocked(self) -> dict:
+    def _get_records(self) -> tuple[dict, ...]:
+        # Only this process writes the file, so the cached records are reused
+        # unless the mtime shows the file was replaced or edited externally.
+        mtime_ns = self._file_mtime_ns()
+        if self._records is None or mtime_ns != self._loaded_mtime_ns:
+            self._needs_compact = False
+            self._file_digest = None
+            self._pending = {}
+            self._records = tuple(self._cleanup_old_records(self._load_unlocked()))
+            self._reindex_unlocked()
+            self._loaded_mtime_ns = mtime_ns
+        return self._records
+
+    def _snapshot(self) -> tuple[dict, ...]:
+        records = self._records
+        if records is None or self._file_mtime_ns() != self._loaded_mtime_ns:
+            with self._write_lock:
+                records = self._get_records()
+        return records
+
+    def _reindex_unlocked(self) -> None:
+        self._index_by_key = {}
+        self._search_texts = {}
+        for item in self._records or ():
+            self._index_record_unlocked(item)
+
+    def _index_record_unlocked(self, item: dict) -> None:
+        merge_key = item["merge_key"]
+        if merge_key:
+            self._index_by_key[merge_key] = item
+        self._search_texts[item["id"]] = _search_text(item)
+
+    def _unindex_unlocked(self, removed: list[dict]) -> None:
+        index_by_key = self._index_by_key
+        for item in removed:
+            merge_key = item["merge_key"]
+            if merge_key and index_by_key.get(merge_key) is item:
+                del index_by_key[merge_key]
+            self._search_texts.pop(item["id"], None)
+            self._pending.pop(item["id"], None)
+
+    def _load_unlocked(self) -> list[dict]:
+        self._log_lines = 0
         try:
-            if self.file_path.exists():
-                with self.file_path.open("r", encoding="utf-8") as fh:
-                    loaded = json.load(fh)
-                    if isinstance(loaded, dict):
-                        records = loaded.get("records", [])
-                        if isinstance(records, list):
-                            return {"records": records, "version": loaded.get("version", 1)}
+            raw = self.file_path.read_bytes()
+        except FileNotFoundError:
+            return []
         except Exception:
-            pass
-        return {"records": [], "version": 1}
+            self._needs_compact = True
+            return []
+
+        lines = raw.splitlines()
+        if lines and lines[0].strip() == b"{":
+            # Legacy single-document format: {"records": [...], "version": 1}.
+            self._needs_compact = True
+            try:
+                loaded = json.loads(raw)
+            except ValueError:
+                return []
+            items = loaded.get("records", []) if isinstance(loaded, dict) else []
+            if not isinstance(items, list):
+                return []
+            return [_normalize_record(item) for item in items if isinstance(item, dict)]
 
-    def _save_unlocked(self, data: dict) -> bool:
+        records: dict[str, dict] = {}
+        for line in lines:
+            if not line.strip():
+                continue
+            self._log_lines += 1
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A torn tail line from an interrupted append.
+                continue
+            if not isinstance(entry, dict):
+                continue
+            op = entry.get("op")
+            if op == "upsert":
+                record = entry.get("record")
+                if isinstance(record, dict):
+                    records[_safe_str(record.get("id"))] = _normalize_record(record)
+            elif op == "delete":
+                records.pop(_safe_str(entry.get("id")), None)
+            elif op == "clear":
+                records.clear()
+        if self._log_lines > self.compact_factor * self.max_records:
+            self._needs_compact = True
+        return list(records.values())
+
+    def _append_unlocked(self, entries: list[dict]) -> bool:
+        if self._pending:
+            entries = [{"op": "upsert", "record": record} for record in self._pending.values()] + entries
+            self._pending = {}
+            self._last_flush = time.monotonic()
+        if self._needs_compact or self._log_lines + len(entries) > self.compact_factor * self.max_records:
+            return self._compact_unlocked()
         try:
             self.file_path.parent.mkdir(parents=True, exist_ok=True)
-            with self.file_path.open("w", encoding="utf-8") as fh:
-                json.dump(data, fh, ensure_ascii=False, indent=2)
+            payload = "".join(_encode_json(entry) + "\n" for entry in entries).encode("utf-8")
+            with self.file_path.open("ab") as fh:
+                fh.write(payload)
+            self._log_lines += len(entries)
+            self._file_digest = None
+            self._loaded_mtime_ns = self._file_mtime_ns()
             return True
         except Exception:
+            # Memory is ahead of the log now; rewrite it in full on the next write.
+            self._needs_compact = True
             return False
 
+    def _compact_unlocked(self) -> bool:
+        records = self._records or ()
+        self._pending = {}
+        self._last_flush = time.monotonic()
+        tmp_path = self.file_path.with_name(f".{self.file_path.name}.tmp")
+        try:
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            payload = "".join(
+                _encode_json({"op": "upsert", "record": record}) + "\n" for record in records
+            ).encode("utf-8")
+            digest = hashlib.blake2b(payload, digest_size=16).digest()
+            if digest == self._file_digest and self._loaded_mtime_ns == self._file_mtime_ns():
+                # Nothing was appended since the last compaction and the content is unchanged.
+                self._needs_compact = False
+                return True
+            with tmp_path.open("wb") as fh:
+                fh.write(payload)
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp_path, self.file_path)
+            self._file_digest = digest
+            self._loaded_mtime_ns = self._file_mtime_ns()
+            self._log_lines = len(records)
+            self._needs_compact = False
+            return True
+        except Exception:
+            self._needs_compact = True
+            return False
+
+    def _overflow_positions(self, records: Sequence[dict]) -> set[int]:
+        # Records are appended in roughly timestamp order and usually overflow
+        # by one, so select just the oldest victims instead of sorting everything.
+        overflow = len(records) - self.max_records
+        if overflow <= 0:
+            return set()
+        return set(
+            heapq.nsmallest(
+                overflow,
+                range(len(records)),
+                key=lambda idx: _record_timestamp(records[idx]),
+            )
+        )
+
     def _cleanup_old_records(self, records: list[dict]) -> list[dict]:
-        if len(records) <= self.max_records:
+        victims = self._overflow_positions(records)
+        if not victims:
             return records
-        sorted_records = sorted(
-            records,
-            key=lambda x: _safe_int(x.get("timestamp"), 0),
-            reverse=True,
-        )
-        return sorted_records[: self.max_records]
+        return [item for idx, item in enumerate(records) if idx not in victims]
 
     def query_records(
         self,
@@ -97,60 +342,44 @@ class ProxyRecordStore:
         app_lower = _safe_str(app_name).lower()
         host_lower = _safe_str(host).lower()
 
-        with self.lock:
-            data = self._load_unlocked()
-            records = data.get("records", [])
-            if not isinstance(records, list):
-                records = []
+        records = self._snapshot()
 
-        filtered: list[dict] = []
-        for item_raw in records:
-            item = item_raw if isinstance(item_raw, dict) else {}
-            proxy_name = _safe_str(item.get("proxy_name"))
-            group_name = _safe_str(item.get("group_name"))
-            target_node = _safe_str(item.get("target_node"))
-            record_subscription = _safe_str(item.get("subscription"))
-            record_item_type = _safe_str(item.get("type"))
-            record_app = _safe_str(item.get("app_name"))
-            record_process_path = _safe_str(item.get("process_path"))
-            record_host = _safe_str(item.get("host"))
-            record_destination = _safe_str(item.get("destination"))
-            record_rule = _safe_str(item.get("rule"))
+        if not (keyword_lower or subscription_lower or record_type_text or app_lower or host_lower):
+            result = heapq.nlargest(limit, records, key=_record_timestamp)
+            return result, {"total": len(records), "filtered": len(records), "returned": len(result)}
 
-            if keyword_lower:
-                keyword_hit = any(
-                    keyword_lower in text.lower()
-                    for text in [
-                        proxy_name,
-                        group_name,
-                        target_node,
-                        record_app,
-                        record_process_path,
-                        record_host,
-                        record_destination,
-                        record_rule,
-                    ]
-                )
-                if not keyword_hit:
-                    continue
-
-            if subscription_lower and subscription_lower not in record_subscription.lower():
+        filtered: list[dict] = []
+        search_texts = self._search_texts
+        for item in records:
+            # Cheapest checks first; fields are only lowered for active filters.
+            if record_type_text and record_type_text != item["type"]:
                 continue
-            if record_type_text and record_type_text != record_item_type:
+            if subscription_lower and subscription_lower not in item["subscription"].lower():
                 continue
+            if keyword_lower:
+                text = search_texts.get(item["id"])
+                if text is None:
+                    text = _search_text(item)
+                if keyword_lower not in text:
+                    continue
             if app_lower:
-                app_hit = app_lower in record_app.lower() or app_lower in record_process_path.lower()
+                app_hit = (
+                    app_lower in item["app_name"].lower()
+                    or app_lower in item["process_path"].lower()
+                )
                 if not app_hit:
                     continue
             if host_lower:
-                host_hit = host_lower in record_host.lower() or host_lower in record_destination.lower()
+                host_hit = (
+                    host_lower in item["host"].lower()
+                    or host_lower in item["destination"].lower()
+                )
                 if not host_hit:
                     continue
 
             filtered.append(item)
 
-        filtered.sort(key=lambda x: _safe_int(x.get("timestamp"), 0), reverse=True)
-        result = filtered[:limit]
+        result = heapq.nlargest(limit, filtered, key=_record_timestamp)
         stats = {
             "total": len(records),
             "filtered": len(filtered),
@@ -193,56 +422,46 @@ class ProxyRecordStore:
 
     def add_record(self, body: dict) -> tuple[bool, dict | None]:
         payload = body if isinstance(body, dict) else {}
-        with self.lock:
-            data = self._load_unlocked()
-            records = data.get("records", [])
-            if not isinstance(records, list):
-                records = []
-            record = self._build_record(payload, len(records))
-            records.append(record)
-            records = self._cleanup_old_records(records)
-            data["records"] = records
-            ok = self._save_unlocked(data)
-            if not ok:
+        with self._write_lock:
+            records = self._get_records()
+            record = self._build_record(payload, self._next_seq())
+            self._records = records + (record,)
+            self._index_record_unlocked(record)
+            self._trim_unlocked()
+            if not self._append_unlocked([{"op": "upsert", "record": record}]):
                 return False, None
             return True, record
 
-    @staticmethod
-    def _hash_text(parts: list[str]) -> str:
-        raw = "|".join(parts)
-        return hashlib.sha1(raw.encode("utf-8", errors="ignore")).hexdigest()
+    def _next_seq(self) -> int:
+        self._seq += 1
+        return self._seq
+
+    def _trim_unlocked(self) -> None:
+        records = self._records or ()
+        victims = self._overflow_positions(records)
+        if victims:
+            self._unindex_unlocked([records[idx] for idx in victims])
+            self._records = tuple(item for idx, item in enumerate(records) if idx not in victims)
 
     def _apply_connection_update(self, current: dict, event: dict, now_ts: int) -> None:
+        safe_str = _safe_str
+        get = event.get
         current["timestamp"] = now_ts
         current["type"] = "connection"
         current["delay_ms"] = -1
         current["success"] = True
-        current["proxy_name"] = _safe_str(event.get("target_node")) or _safe_str(current.get("proxy_name"))
-        current["group_name"] = _safe_str(event.get("group_name")) or _safe_str(current.get("group_name"))
-        current["target_node"] = _safe_str(event.get("target_node")) or _safe_str(current.get("target_node"))
-        current["app_name"] = _safe_str(event.get("app_name")) or _safe_str(current.get("app_name"))
-        current["process_path"] = _safe_str(event.get("process_path")) or _safe_str(
-            current.get("process_path")
-        )
-        current["host"] = _safe_str(event.get("host")) or _safe_str(current.get("host"))
-        current["destination"] = _safe_str(event.get("destination")) or _safe_str(
-            current.get("destination")
-        )
-        current["rule"] = _safe_str(event.get("rule")) or _safe_str(current.get("rule"))
-        current["rule_payload"] = _safe_str(event.get("rule_payload")) or _safe_str(
-            current.get("rule_payload")
-        )
-        current["network"] = _safe_str(event.get("network")) or _safe_str(current.get("network"))
-        current["conn_type"] = _safe_str(event.get("conn_type")) or _safe_str(current.get("conn_type"))
-        chains = _safe_list_of_str(event.get("chains"))
+        # `current` is a stored record, so its fields are already clean strings.
+        current["proxy_name"] = safe_str(get("target_node")) or current["proxy_name"]
+        for field in _MERGED_FIELDS:
+            current[field] = safe_str(get(field)) or current[field]
+        chains = _safe_list_of_str(get("chains"))
         if chains:
             current["chains"] = chains
-        current["merge_key"] = _safe_str(event.get("merge_key")) or _safe_str(current.get("merge_key"))
         current["hit_count"] = max(1, _safe_int(current.get("hit_count"), 1) + 1)
-        current["upload"] = max(_safe_int(current.get("upload"), 0), _safe_int(event.get("upload"), 0))
+        current["upload"] = max(_safe_int(current.get("upload"), 0), _safe_int(get("upload"), 0))
         current["download"] = max(
             _safe_int(current.get("download"), 0),
-            _safe_int(event.get("download"), 0),
+            _safe_int(get("download"), 0),
         )
 
     def _build_connection_record(self, event: dict, record_id_seed: int, now_ts: int) -> dict:
@@ -277,27 +496,19 @@ class ProxyRecordStore:
         if not events:
             return 0
 
-        with self.lock:
-            data = self._load_unlocked()
-            records = data.get("records", [])
-            if not isinstance(records, list):
-                records = []
-
-            index_by_key: dict[str, int] = {}
-            for idx, item in enumerate(records):
-                if not isinstance(item, dict):
-                    continue
-                merge_key = _safe_str(item.get("merge_key"))
-                if merge_key:
-                    index_by_key[merge_key] = idx
+        with self._write_lock:
+            records = self._get_records()
+            index_by_key = self._index_by_key
+            changed: dict[int, dict] = {}
+            replaced: dict[int, dict] = {}
+            added: list[dict] = []
 
             now_ts = int(time.time())
             merged_count = 0
-            for event_raw in events:
-                event = event_raw if isinstance(event_raw, dict) else {}
+            for event in events:
                 merge_key = _safe_str(event.get("merge_key"))
                 if not merge_key:
-                    merge_key = self._hash_text(
+                    merge_key = _hash_text(
                         [
                             _safe_str(event.get("app_name")),
                             _safe_str(event.get("host")),
@@ -312,84 +523,117 @@ class ProxyRecordStore:
                     )
                     event["merge_key"] = merge_key
 
-                idx = index_by_key.get(merge_key)
-                if idx is None:
-                    record = self._build_connection_record(event, len(records), now_ts)
-                    records.append(record)
-                    index_by_key[merge_key] = len(records) - 1
+                item = index_by_key.get(merge_key)
+                if item is None:
+                    record = self._build_connection_record(event, self._next_seq(), now_ts)
+                    added.append(record)
+                    index_by_key[merge_key] = record
+                    changed[id(record)] = record
                     merged_count += 1
                     continue
 
-                item = records[idx] if isinstance(records[idx], dict) else {}
+                if id(item) not in changed:
+                    # Published records are shared with readers; update a copy.
+                    old_item = item
+                    item = dict(old_item)
+                    index_by_key[merge_key] = item
+                    replaced[id(old_item)] = item
                 self._apply_connection_update(item, event, now_ts)
-                records[idx] = item
+                changed[id(item)] = item
                 merged_count += 1
 
-            records = self._cleanup_old_records(records)
-            data["records"] = records
-            if not self._save_unlocked(data):
+            if replaced:
+                records = tuple(replaced.get(id(item), item) for item in records)
+            self._records = records + tuple(added)
+            pending = self._pending
+            for item in changed.values():
+                self._index_record_unlocked(item)
+                pending[item["id"]] = item
+            self._trim_unlocked()
+            if len(pending) < self.flush_size and time.monotonic() - self._last_flush < self.flush_interval:
+                return merged_count
+            if not self._append_unlocked([]):
                 return 0
             return merged_count
 
+    def flush(self, force: bool = True) -> bool:
+        with self._write_lock:
+            if not self._pending:
+                return True
+            if not force and time.monotonic() - self._last_flush < self.flush_interval:
+                return True
+            return self._append_unlocked([])
+
     def delete_record(self, record_id: str) -> tuple[bool, bool]:
         target_id = _safe_str(record_id)
         if not target_id:
             return False, False
 
-        with self.lock:
-            data = self._load_unlocked()
-            records = data.get("records", [])
-            if not isinstance(records, list):
-                records = []
-            original_len = len(records)
-            records = [r for r in records if _safe_str((r or {}).get("id")) != target_id]
-            found = len(records) != original_len
-            if not found:
+        with self._write_lock:
+            records = self._get_records()
+            removed = [r for r in records if r["id"] == target_id]
+            if not removed:
                 return False, False
-            data["records"] = records
-            ok = self._save_unlocked(data)
+            self._records = tuple(r for r in records if r["id"] != target_id)
+            self._unindex_unlocked(removed)
+            ok = self._append_unlocked([{"op": "delete", "id": target_id}])
             return ok, True
 
     def clear_records(self) -> bool:
-        with self.lock:
-            return self._save_unlocked({"records": [], "version": 1})
+        with self._write_lock:
+            self._records = ()
+            self._index_by_key = {}
+            self._search_texts = {}
+            return self._compact_unlocked()
 
     def get_stats(self) -> dict:
-        with self.lock:
-            data = self._load_unlocked()
-            records = data.get("records", [])
-            if not isinstance(records, list):
-                records = []
-
-        subscriptions = Counter(_safe_str((r or {}).get("subscription")) or "未知" for r in records)
-        providers = Counter(_safe_str((r or {}).get("provider")) or "未知" for r in records)
-        types = Counter(_safe_str((r or {}).get("type")) or "unknown" for r in records)
-        apps = Counter(_safe_str((r or {}).get("app_name")) or "未知" for r in records)
-        hosts = Counter(
-            (_safe_str((r or {}).get("host")) or _safe_str((r or {}).get("destination")) or "未知")
-            for r in records
-        )
-
-        daily_counts = Counter()
+        records = self._snapshot()
+
+        subscriptions: dict[str, int] = {}
+        providers: dict[str, int] = {}
+        types: dict[str, int] = {}
+        apps: dict[str, int] = {}
+        hosts: dict[str, int] = {}
+        # Every UTC offset and DST switch falls on a 15-minute boundary, so count
+        # per quarter-hour and format each distinct bucket's local day once.
+        quarter_counts: dict[int, int] = {}
         for item in records:
-            ts = _safe_int((item or {}).get("timestamp"), 0)
-            if ts <= 0:
-                continue
-            day = datetime.fromtimestamp(ts).strftime("%Y-%m-%d")
-            daily_counts[day] += 1
+            key = item["subscription"] or "未知"
+            subscriptions[key] = subscriptions.get(key, 0) + 1
+            key = item["provider"] or "未知"
+            providers[key] = providers.get(key, 0) + 1
+            key = item["type"] or "unknown"
+            types[key] = types.get(key, 0) + 1
+            key = item["app_name"] or "未知"
+            apps[key] = apps.get(key, 0) + 1
+            key = item["host"] or item["destination"] or "未知"
+            hosts[key] = hosts.get(key, 0) + 1
+            ts = item["timestamp"]
+            if ts > 0:
+                bucket = ts // QUARTER_HOUR_SECONDS
+                quarter_counts[bucket] = quarter_counts.get(bucket, 0) + 1
+
+        daily_counts: dict[str, int] = {}
+        for bucket, count in quarter_counts.items():
+            day = datetime.fromtimestamp(bucket * QUARTER_HOUR_SECONDS).strftime("%Y-%m-%d")
+            daily_counts[day] = daily_counts.get(day, 0) + count
 
         return {
             "total": len(records),
-            "subscriptions": dict(subscriptions),
-            "providers": dict(providers),
-            "types": dict(types),
-            "apps": dict(apps),
-            "hosts": dict(hosts),
-            "daily_counts": dict(daily_counts),
+            "subscriptions": subscriptions,
+            "providers": providers,
+            "types": types,
+            "apps": apps,
+            "hosts": hosts,
+            "daily_counts": daily_counts,
         }
 
 
 class ClashConnectionRecorder:
+    # Hard cap on extra poll intervals while idle: a connection that opens and
+    # closes inside the stretched wait is never seen, so keep the gap short.
+    max_idle_backoff = 1
+
     def __init__(
         self,
         clash_api: str,
@@ -398,6 +642,8 @@ class ClashConnectionRecorder:
         emit_log: Callable[[str, str], None] | Callable[[str], None],
         poll_interval: int = 6,
         request_timeout: int = 5,
+        session: requests.Session | None = None,
+        idle_backoff: int = 0,
     ) -> None:
         self.clash_api = _safe_str(clash_api).rstrip("/")
         self.headers_func = headers_func
@@ -405,12 +651,19 @@ class ClashConnectionRecorder:
         self.emit_log = emit_log
         self.poll_interval = max(3, _safe_int(poll_interval, 6))
         self.request_timeout = max(3, _safe_int(request_timeout, 5))
+        # Off by default: polls stay at a fixed poll_interval unless opted in.
+        self.idle_backoff = min(max(0, _safe_int(idle_backoff, 0)), self.max_idle_backoff)
+        self._effective_interval = self.poll_interval
+        # Keep-alive session so each poll reuses the controller connection.
+        self.session = session or requests.Session()
 
         self._stop_event = threading.Event()
         self._state_lock = threading.Lock()
         self._capture_lock = threading.Lock()
         self._thread: threading.Thread | None = None
-        self._active_connection_fingerprints: dict[str, str] = {}
+        self._active_connection_fingerprints: dict[int, int] = {}
+        # Clash connection id -> (raw chains, connection hash, fingerprint) from the last poll.
+        self._parse_cache: dict[str, tuple[object, int, int]] = {}
 
     def _log(self, message: str, level: str = "INFO") -> None:
         try:
@@ -420,11 +673,6 @@ class ClashConnectionRecorder:
         except Exception:
             pass
 
-    @staticmethod
-    def _hash_text(parts: list[str]) -> str:
-        raw = "|".join(parts)
-        return hashlib.sha1(raw.encode("utf-8", errors="ignore")).hexdigest()
-
     def _extract_destination(self, metadata: dict) -> str:
         remote_destination = _safe_str(metadata.get("remoteDestination"))
         if remote_destination:
@@ -443,43 +691,50 @@ class ClashConnectionRecorder:
         return src_ip
 
     def _parse_connection(self, item: dict) -> dict | None:
-        if not isinstance(item, dict):
-            return None
+        # `item` comes from _fetch_connections, which only keeps dicts.
         metadata = item.get("metadata", {})
         if not isinstance(metadata, dict):
             metadata = {}
+        # Runs for every live connection on every poll; bind the lookups locally.
+        safe_str = _safe_str
+        get = item.get
+        meta = metadata.get
 
         process_name = (
-            _safe_str(metadata.get("process"))
-            or _safe_str(metadata.get("processName"))
-            or _safe_str(metadata.get("process_name"))
+            safe_str(meta("process"))
+            or safe_str(meta("processName"))
+            or safe_str(meta("process_name"))
         )
-        process_path = _safe_str(metadata.get("processPath")) or _safe_str(metadata.get("process_path"))
+        process_path = safe_str(meta("processPath")) or safe_str(meta("process_path"))
         host = (
-            _safe_str(metadata.get("host"))
-            or _safe_str(metadata.get("sniffHost"))
-            or _safe_str(metadata.get("sniff_host"))
+            safe_str(meta("host"))
+            or safe_str(meta("sniffHost"))
+            or safe_str(meta("sniff_host"))
         )
         destination = self._extract_destination(metadata)
         source = self._extract_source(metadata)
 
-        chains = _safe_list_of_str(item.get("chains"))
+        chains = _safe_list_of_str(get("chains"))
         group_name = chains[0] if len(chains) > 1 else ""
-        target_node = chains[-1] if chains else (_safe_str(item.get("outbound")) or _safe_str(item.get("outboundName")))
+        target_node = chains[-1] if chains else (safe_str(get("outbound")) or safe_str(get("outboundName")))
 
-        rule = _safe_str(item.get("rule"))
-        rule_payload = _safe_str(item.get("rulePayload"))
-        network = _safe_str(metadata.get("network"))
-        conn_type = _safe_str(metadata.get("type"))
-        start_text = _safe_str(item.get("start"))
+        rule = safe_str(get("rule"))
+        rule_payload = safe_str(get("rulePayload"))
+        network = safe_str(meta("network"))
+        conn_type = safe_str(meta("type"))
+        start_text = safe_str(get("start"))
 
         if not (process_name or process_path or host or destination or target_node):
             return None
 
-        connection_id = _safe_str(item.get("id"))
-        if not connection_id:
-            connection_id = self._hash_text(
-                [
+        # connection_id and fingerprint only live in memory for change detection,
+        # so the process-local hash() of the fields is enough.
+        connection_text = safe_str(get("id"))
+        if connection_text:
+            connection_id = hash(connection_text)
+        else:
+            connection_id = hash(
+                (
                     source,
                     destination,
                     host,
@@ -487,10 +742,10 @@ class ClashConnectionRecorder:
                     process_path,
                     start_text,
                     target_node,
-                ]
+                )
             )
-        fingerprint = self._hash_text(
-            [
+        fingerprint = hash(
+            (
                 process_name,
                 process_path,
                 host,
@@ -500,9 +755,9 @@ class ClashConnectionRecorder:
                 rule,
                 rule_payload,
                 start_text,
-            ]
+            )
         )
-        merge_key = self._hash_text(
+        merge_key = _hash_text(
             [
                 process_name,
                 host,
@@ -539,7 +794,7 @@ class ClashConnectionRecorder:
         if not self.clash_api:
             return []
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.clash_api}/connections",
                 headers=self.headers_func() or {},
                 timeout=self.request_timeout,
@@ -561,37 +816,60 @@ class ClashConnectionRecorder:
             connections = self._fetch_connections()
             if not connections:
                 self._active_connection_fingerprints = {}
+                self._parse_cache = {}
                 return 0
 
             previous = self._active_connection_fingerprints
-            next_active: dict[str, str] = {}
+            parse_cache = self._parse_cache
+            next_active: dict[int, int] = {}
+            next_cache: dict[str, tuple[object, int, int]] = {}
             events: list[dict] = []
             for item in connections:
+                # A Clash connection keeps its id, metadata and chains for its whole
+                # life; only the traffic counters move, which never produce an event.
+                raw_id = item.get("id")
+                if type(raw_id) is not str:
+                    raw_id = ""
+                cached = parse_cache.get(raw_id) if raw_id else None
+                if cached is not None and cached[0] == item.get("chains"):
+                    next_active[cached[1]] = cached[2]
+                    next_cache[raw_id] = cached
+                    continue
+
                 parsed = self._parse_connection(item)
                 if not parsed:
                     continue
 
-                connection_id = _safe_str(parsed.pop("connection_id"))
-                fingerprint = _safe_str(parsed.pop("fingerprint"))
-                if not connection_id or not fingerprint:
-                    continue
+                connection_id = parsed.pop("connection_id")
+                fingerprint = parsed.pop("fingerprint")
                 next_active[connection_id] = fingerprint
+                if raw_id:
+                    next_cache[raw_id] = (item.get("chains"), connection_id, fingerprint)
                 if previous.get(connection_id) == fingerprint:
                     continue
                 events.append(parsed)
 
             self._active_connection_fingerprints = next_active
+            self._parse_cache = next_cache
             if not events:
                 return 0
             return self.store.merge_connection_events(events)
 
     def _loop(self) -> None:
+        idle_polls = 0
         while not self._stop_event.is_set():
+            captured = 0
             try:
-                self.capture_once()
+                captured = self.capture_once()
             except Exception as exc:
                 self._log(f"connection recorder capture failed: {exc}", "WARN")
-            self._stop_event.wait(self.poll_interval)
+            self.store.flush(force=False)
+            # Each poll downloads and parses the whole connection list, so stretch
+            # the interval while nothing changes and snap back on the next change.
+            # Connections shorter than the stretched wait are missed while idle.
+            idle_polls = 0 if captured else min(idle_polls + 1, self.idle_backoff)
+            self._effective_interval = self.poll_interval * (1 + idle_polls)
+            self._stop_event.wait(self._effective_interval)
 
     def start(self) -> None:
         with self._state_lock:
@@ -604,6 +882,7 @@ class ClashConnectionRecorder:
     def stop(self) -> None:
         with self._state_lock:
             self._stop_event.set()
+        self.store.flush()
 
     def status(self) -> dict:
         active = 0
@@ -613,6 +892,8 @@ class ClashConnectionRecorder:
         return {
             "running": bool(active),
             "poll_interval": self.poll_interval,
+            "idle_backoff": self.idle_backoff,
+            "effective_poll_interval": self._effective_interval if active else self.poll_interval,
             "request_timeout": self.request_timeout,
             "active_connections": len(self._active_connection_fingerprints),
         }
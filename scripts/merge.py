@@ -13,14 +13,25 @@ import re
 import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import chain
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 import requests
 import yaml
+from requests.adapters import HTTPAdapter
+
+try:
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as YamlSafeLoader
 
 DEFAULT_EXTERNAL_CONTROLLER = "0.0.0.0:9090"
+SUB_FETCH_WORKERS = 8
+# Upper bound on a single subscription body; larger responses are rejected.
+MAX_SUB_BYTES = 16 * 1024 * 1024
 
 # Import unified configuration
 # Note: When merge.py is imported as a module, cfg is already available in api_server.py
@@ -113,9 +124,22 @@ def load_json(path: Path, default: Any) -> Any:
         return copy.deepcopy(default)
 
 
+def replace_text(path: Path, content: str) -> None:
+    """Write via a sibling temp file + os.replace so readers never see a partial file."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_text(content, encoding="utf-8")
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+
+
 def save_json(path: Path, data: Any) -> None:
-    with path.open("w", encoding="utf-8") as fh:
-        json.dump(data, fh, ensure_ascii=False, indent=2)
+    replace_text(path, json.dumps(data, ensure_ascii=False, indent=2))
 
 
 def load_yaml(path: Path, default: Any) -> Any:
@@ -123,7 +147,7 @@ def load_yaml(path: Path, default: Any) -> Any:
         return copy.deepcopy(default)
     try:
         with path.open("r", encoding="utf-8") as fh:
-            data = yaml.safe_load(fh)
+            data = yaml.load(fh, Loader=YamlSafeLoader)
         return data if data is not None else copy.deepcopy(default)
     except Exception as exc:
         log(f"failed to load yaml {path}: {exc}")
@@ -131,8 +155,9 @@ def load_yaml(path: Path, default: Any) -> Any:
 
 
 def save_yaml(path: Path, data: Any) -> None:
-    with path.open("w", encoding="utf-8") as fh:
-        yaml.safe_dump(data, fh, allow_unicode=True, sort_keys=False)
+    # Dump to one string so the file is written in a single call. The pure-Python
+    # dumper is kept on purpose: libyaml escapes flag emoji in proxy names.
+    replace_text(path, yaml.safe_dump(data, allow_unicode=True, sort_keys=False))
 
 
 def read_text(path: Path) -> str:
@@ -161,74 +186,85 @@ def normalize_proxy_name(name: str, prefix: str = "") -> str:
     return base
 
 
+def compile_filter(pattern: str) -> re.Pattern[str] | None:
+    if not pattern:
+        return None
+    try:
+        return re.compile(pattern)
+    except re.error:
+        # Ignore invalid regex configured by user; keep proxy.
+        log(f"invalid filter regex {pattern!r}, ignored")
+        return None
+
+
 def should_keep_proxy(
     proxy_name: str,
-    include_filter: str = "",
-    exclude_filter: str = "",
+    include_re: re.Pattern[str] | None = None,
+    exclude_re: re.Pattern[str] | None = None,
 ) -> bool:
-    if include_filter:
-        try:
-            if not re.search(include_filter, proxy_name):
-                return False
-        except re.error:
-            # Ignore invalid regex configured by user; keep proxy.
-            pass
-    if exclude_filter:
-        try:
-            if re.search(exclude_filter, proxy_name):
-                return False
-        except re.error:
-            pass
+    if include_re is not None and not include_re.search(proxy_name):
+        return False
+    if exclude_re is not None and exclude_re.search(proxy_name):
+        return False
     return True
 
 
-def proxy_fingerprint(proxy: dict[str, Any]) -> str:
-    keys = [
-        "type",
-        "server",
-        "port",
-        "uuid",
-        "password",
-        "cipher",
-        "network",
-        "plugin",
-    ]
-    return "|".join(str(proxy.get(key, "")) for key in keys)
-
-
-def unique_items(items: list[str]) -> list[str]:
-    seen = set()
-    result: list[str] = []
-    for item in items:
-        if item in seen:
-            continue
-        seen.add(item)
-        result.append(item)
-    return result
+FINGERPRINT_KEYS = (
+    "type",
+    "server",
+    "port",
+    "uuid",
+    "password",
+    "cipher",
+    "network",
+    "plugin",
+)
+
+
+_FINGERPRINT_DEFAULTS = ("",) * len(FINGERPRINT_KEYS)
+
+
+def proxy_fingerprint(proxy: dict[str, Any]) -> tuple[Any, ...]:
+    # map() over the bound dict.get stays in C; no generator frame per proxy.
+    return tuple(map(proxy.get, FINGERPRINT_KEYS, _FINGERPRINT_DEFAULTS))
+
+
+def unique_items(items: Iterable[str]) -> list[str]:
+    # dict preserves insertion order, so this keeps the first occurrence of each item.
+    return list(dict.fromkeys(items))
 
 
 def ensure_unique_proxy_names(proxies: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    used: dict[str, int] = {}
+    seen: set[str] = set()
+    next_suffix: dict[str, int] = {}
     for proxy in proxies:
         name = str(proxy.get("name") or "node").strip()
-        if name not in used:
-            used[name] = 1
+        if name not in seen:
+            seen.add(name)
             proxy["name"] = name
             continue
-        count = used[name]
-        while True:
-            candidate = f"{name}_{count}"
+        count = next_suffix.get(name, 1)
+        candidate = f"{name}_{count}"
+        # Only probe further when a literal "<name>_<n>" already took this slot.
+        while candidate in seen:
             count += 1
-            if candidate not in used:
-                proxy["name"] = candidate
-                used[name] = count
-                used[candidate] = 1
-                break
+            candidate = f"{name}_{count}"
+        seen.add(candidate)
+        next_suffix[name] = count + 1
+        proxy["name"] = candidate
     return proxies
 
 
 def parse_subscription_proxies(text: str) -> list[dict[str, Any]]:
-    parsed = yaml.safe_load(text)
+    parsed = None
+    if text.lstrip()[:1] in ("{", "["):
+        # JSON feeds are valid YAML too, but the C json parser is far cheaper.
+        try:
+            parsed = json.loads(text)
+        except ValueError:
+            parsed = None
+    if parsed is None:
+        parsed = yaml.load(text, Loader=YamlSafeLoader)
     if isinstance(parsed, dict):
         proxies = parsed.get("proxies", [])
         if isinstance(proxies, list):
@@ -236,49 +272,95 @@ def parse_subscription_proxies(text: str) -> list[dict[str, Any]]:
     raise ValueError("subscription payload must be clash yaml with 'proxies' list")
 
 
-def fetch_subscription(sub: dict[str, Any]) -> tuple[list[dict[str, Any]], str]:
+def build_fetch_session() -> requests.Session:
+    """Keep-alive session shared by the fetch workers, one pooled slot per worker."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=SUB_FETCH_WORKERS, pool_maxsize=SUB_FETCH_WORKERS)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def fetch_subscription(
+    sub: dict[str, Any],
+    session: requests.Session | None = None,
+) -> tuple[list[dict[str, Any]], str]:
     name = str(sub.get("name", "sub")).strip()
     url = str(sub.get("url", "")).strip()
     prefix = str(sub.get("prefix", "")).strip()
-    include_filter = str(sub.get("include_filter", "")).strip()
-    exclude_filter = str(sub.get("exclude_filter", "")).strip()
+    include_re = compile_filter(str(sub.get("include_filter", "")).strip())
+    exclude_re = compile_filter(str(sub.get("exclude_filter", "")).strip())
 
     if not url:
         raise ValueError(f"subscription '{name}' has empty url")
 
-    response = requests.get(
+    http = session or requests
+    with http.get(
         url,
         headers={"User-Agent": "clash-manager/1.0"},
         timeout=cfg.runtime.sub_request_timeout,
-    )
-    response.raise_for_status()
-
-    fetched = parse_subscription_proxies(response.text)
+        stream=True,
+    ) as response:
+        response.raise_for_status()
+        raw = response.raw.read(MAX_SUB_BYTES + 1, decode_content=True)
+        encoding = response.encoding or "utf-8"
+    if len(raw) > MAX_SUB_BYTES:
+        raise ValueError(f"subscription '{name}' exceeds {MAX_SUB_BYTES} bytes")
+    # Decode explicitly: response.text would run charset detection over the whole body.
+    text = raw.decode(encoding, errors="replace")
+
+    fetched = parse_subscription_proxies(text)
     filtered: list[dict[str, Any]] = []
 
     for proxy in fetched:
-        current = copy.deepcopy(proxy)
-        current_name = normalize_proxy_name(str(current.get("name", "node")), prefix)
-        if not should_keep_proxy(current_name, include_filter, exclude_filter):
+        current_name = normalize_proxy_name(str(proxy.get("name", "node")), prefix)
+        if not should_keep_proxy(current_name, include_re, exclude_re):
             continue
+        # The parsed tree is private to this call, so only the top level is copied;
+        # that still keeps YAML aliases of one proxy from being renamed twice.
+        current = dict(proxy)
         current["name"] = current_name
         filtered.append(current)
 
-    return filtered, response.text
+    return filtered, text
 
 
-def deduplicate_proxies(proxies: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    by_fingerprint = set()
-    result: list[dict[str, Any]] = []
+def append_unique_proxies(
+    result: list[dict[str, Any]],
+    proxies: list[dict[str, Any]],
+    seen: set[tuple[Any, ...]],
+) -> None:
+    """Append proxies whose fingerprint is not in `seen` yet, recording the new ones."""
     for proxy in proxies:
         fingerprint = proxy_fingerprint(proxy)
-        if fingerprint in by_fingerprint:
+        try:
+            duplicate = fingerprint in seen
+        except TypeError:
+            # A list/dict field value makes the tuple unhashable; use its text form.
+            fingerprint = tuple(str(value) for value in fingerprint)
+            duplicate = fingerprint in seen
+        if duplicate:
             continue
-        by_fingerprint.add(fingerprint)
+        seen.add(fingerprint)
         result.append(proxy)
+
+
+def deduplicate_proxies(proxies: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    result: list[dict[str, Any]] = []
+    append_unique_proxies(result, proxies, set())
     return ensure_unique_proxy_names(result)
 
 
+def clone_group(group: dict[str, Any]) -> dict[str, Any]:
+    # Group fields are scalars or lists of names; the proxies list is the only one
+    # merge steps rebuild, so a field-level copy plus that list is enough.
+    cloned = dict(group)
+    proxies = cloned.get("proxies")
+    if isinstance(proxies, list):
+        cloned["proxies"] = list(proxies)
+    return cloned
+
+
 def merge_group_lists(
     groups: list[dict[str, Any]],
     new_groups: list[dict[str, Any]],
@@ -286,12 +368,12 @@ def merge_group_lists(
     by_name: dict[str, dict[str, Any]] = {}
     for group in groups:
         if isinstance(group, dict) and group.get("name"):
-            by_name[str(group["name"])] = copy.deepcopy(group)
+            by_name[str(group["name"])] = clone_group(group)
     for group in new_groups:
         if not isinstance(group, dict) or not group.get("name"):
             continue
         key = str(group["name"])
-        incoming = copy.deepcopy(group)
+        incoming = clone_group(group)
         if key not in by_name:
             by_name[key] = incoming
             continue
@@ -303,34 +385,43 @@ def merge_group_lists(
                 continue
             existing[item_key] = value
         if isinstance(existing_proxies, list) and isinstance(incoming_proxies, list):
-            existing["proxies"] = unique_items(existing_proxies + incoming_proxies)
+            existing["proxies"] = unique_items(chain(existing_proxies, incoming_proxies))
         by_name[key] = existing
     return list(by_name.values())
 
 
 def add_proxies_to_group(group: dict[str, Any], proxy_names: list[str]) -> dict[str, Any]:
-    cloned = copy.deepcopy(group)
+    cloned = clone_group(group)
     use_all = bool(cloned.pop("use_all_proxies", False))
     if use_all:
         current = cloned.get("proxies", [])
         if not isinstance(current, list):
             current = []
-        cloned["proxies"] = unique_items(current + proxy_names)
+        cloned["proxies"] = unique_items(chain(current, proxy_names))
     return cloned
 
 
 def place_rules_before_match(existing: list[str], new_rules: list[str]) -> list[str]:
-    existing_clean = [r for r in existing if isinstance(r, str) and r.strip()]
     new_clean = [r for r in new_rules if isinstance(r, str) and r.strip()]
 
-    match_rules = [r for r in existing_clean if r.startswith("MATCH,")]
-    non_match_rules = [r for r in existing_clean if not r.startswith("MATCH,")]
-    merged = unique_items(new_clean + non_match_rules + match_rules)
-    return merged
+    match_rules: list[str] = []
+    non_match_rules: list[str] = []
+    for rule in existing:
+        if not isinstance(rule, str) or not rule.strip():
+            continue
+        (match_rules if rule.startswith("MATCH,") else non_match_rules).append(rule)
+    return unique_items(chain(new_clean, non_match_rules, match_rules))
 
 
 def deep_merge_config(base: dict[str, Any], override: dict[str, Any]) -> dict[str, Any]:
     result = copy.deepcopy(base)
+    _merge_into(result, override)
+    return result
+
+
+def _merge_into(result: dict[str, Any], override: dict[str, Any]) -> None:
+    # `result` is already a private copy. Override values are adopted without
+    # copying: the override is freshly loaded for each merge and not reused.
     for key, value in override.items():
         if key == "proxy-groups":
             base_groups = result.get("proxy-groups", [])
@@ -351,19 +442,15 @@ def deep_merge_config(base: dict[str, Any], override: dict[str, Any]) -> dict[st
             incoming_proxies = value if isinstance(value, list) else []
             if not isinstance(base_proxies, list):
                 base_proxies = []
-            combined = []
-            for item in base_proxies + incoming_proxies:
-                if isinstance(item, dict):
-                    combined.append(copy.deepcopy(item))
+            combined = [item for item in base_proxies + incoming_proxies if isinstance(item, dict)]
             result["proxies"] = deduplicate_proxies(combined)
             continue
 
         current = result.get(key)
         if isinstance(current, dict) and isinstance(value, dict):
-            result[key] = deep_merge_config(current, value)
+            _merge_into(current, value)
         else:
-            result[key] = copy.deepcopy(value)
-    return result
+            result[key] = value
 
 
 def build_default_template() -> dict[str, Any]:
@@ -399,10 +486,12 @@ def build_default_template() -> dict[str, Any]:
 
 
 def apply_subscription_data(config: dict[str, Any], proxies: list[dict[str, Any]]) -> dict[str, Any]:
-    output = copy.deepcopy(config)
-    output["proxies"] = copy.deepcopy(proxies)
+    # Shallow copy: proxies and proxy-groups are rebuilt below, other keys are left untouched.
+    # The proxy dicts are handed over by the caller, so only the list is copied.
+    output = dict(config)
+    output["proxies"] = list(proxies)
 
-    proxy_names = [str(proxy.get("name", "")) for proxy in proxies if proxy.get("name")]
+    proxy_names = unique_items(str(proxy.get("name", "")) for proxy in proxies if proxy.get("name"))
     groups = output.get("proxy-groups", [])
     if not isinstance(groups, list):
         groups = []
@@ -418,7 +507,7 @@ def apply_subscription_data(config: dict[str, Any], proxies: list[dict[str, Any]
             {
                 "name": "PROXY",
                 "type": "select",
-                "proxies": unique_items(["DIRECT"] + proxy_names),
+                "proxies": unique_items(chain(["DIRECT"], proxy_names)),
             }
         ]
     output["proxy-groups"] = rendered_groups
@@ -426,7 +515,8 @@ def apply_subscription_data(config: dict[str, Any], proxies: list[dict[str, Any]
 
 
 def apply_site_policy(config: dict[str, Any], site_policy: dict[str, Any], proxy_names: list[str]) -> dict[str, Any]:
-    output = copy.deepcopy(config)
+    # Only proxy-groups and rules change, and both are rebuilt as new lists.
+    output = dict(config)
 
     incoming_groups = site_policy.get("groups", [])
     rendered_policy_groups = []
@@ -451,7 +541,8 @@ def apply_site_policy(config: dict[str, Any], site_policy: dict[str, Any], proxy
 
 
 def ensure_runtime_values(config: dict[str, Any]) -> dict[str, Any]:
-    output = copy.deepcopy(config)
+    # Only top-level scalars are set, so a shallow copy is enough.
+    output = dict(config)
     output["allow-lan"] = True
     output["bind-address"] = "*"
     output["external-controller"] = get_external_controller()
@@ -486,7 +577,8 @@ def list_proxy_names(config: dict[str, Any]) -> list[str]:
 
 
 def sanitize_proxy_groups(config: dict[str, Any]) -> dict[str, Any]:
-    output = copy.deepcopy(config)
+    # Only proxy-groups is rebuilt; the rest of the config is shared, not copied.
+    output = dict(config)
     groups = output.get("proxy-groups", [])
     if not isinstance(groups, list):
         return output
@@ -498,7 +590,8 @@ def sanitize_proxy_groups(config: dict[str, Any]) -> dict[str, Any]:
     for group in groups:
         if not isinstance(group, dict):
             continue
-        current = copy.deepcopy(group)
+        # Keys are only set or popped on the group, never edited in place.
+        current = dict(group)
 
         use_items = current.get("use")
         if isinstance(use_items, list):
@@ -527,22 +620,23 @@ def sanitize_proxy_groups(config: dict[str, Any]) -> dict[str, Any]:
     return output
 
 
+# Rules may come back from override.js un-normalized, so match case-insensitively
+# past leading whitespace without allocating stripped/upper-cased copies.
+_GEOIP_RULE_RE = re.compile(r"\s*GEOIP,", re.IGNORECASE)
+
+
 def maybe_disable_geoip_rules(config: dict[str, Any]) -> dict[str, Any]:
     if not env_flag("CLASH_DISABLE_GEOIP"):
         return config
 
-    output = copy.deepcopy(config)
+    output = dict(config)
     rules = output.get("rules", [])
     if not isinstance(rules, list):
         return output
 
-    filtered_rules: list[Any] = []
-    removed = 0
-    for rule in rules:
-        if isinstance(rule, str) and rule.strip().upper().startswith("GEOIP,"):
-            removed += 1
-            continue
-        filtered_rules.append(rule)
+    is_geoip = _GEOIP_RULE_RE.match
+    filtered_rules = [rule for rule in rules if not (isinstance(rule, str) and is_geoip(rule))]
+    removed = len(rules) - len(filtered_rules)
 
     if removed:
         output["rules"] = filtered_rules
@@ -550,12 +644,31 @@ def maybe_disable_geoip_rules(config: dict[str, Any]) -> dict[str, Any]:
     return output
 
 
-def apply_js_override(config: dict[str, Any], script_text: str) -> dict[str, Any]:
-    script = (script_text or "").strip()
-    if not script:
-        return config
+_JS_IDENT = r"[A-Za-z_$][\w$]*"
+# `main` that hands its argument straight back, e.g. `const main = (config) => config;`
+# or `function main(config) { return config; }`.
+_IDENTITY_JS_RE = re.compile(
+    rf"""
+    (?:
+        (?:const|let|var)\s+main\s*=\s*
+        (?:\(\s*(?P<a>{_JS_IDENT})\s*\)|(?P<b>{_JS_IDENT}))\s*=>\s*
+        (?:(?P=a)|(?P=b)|\{{\s*return\s+(?:(?P=a)|(?P=b))\s*;?\s*\}})
+      |
+        function\s+main\s*\(\s*(?P<c>{_JS_IDENT})\s*\)\s*\{{\s*return\s+(?P=c)\s*;?\s*\}}
+    )
+    \s*;?
+    """,
+    re.VERBOSE,
+)
+
+
+def is_identity_script(script: str) -> bool:
+    # Only whole-line `//` comments are dropped; anything else must be the identity `main`.
+    code = "\n".join(line for line in script.splitlines() if not line.strip().startswith("//"))
+    return _IDENTITY_JS_RE.fullmatch(code.strip()) is not None
 
-    js_runner = r"""
+
+JS_OVERRIDE_RUNNER = r"""
 const fs = require("fs");
 
 const payload = JSON.parse(fs.readFileSync(0, "utf8"));
@@ -586,13 +699,36 @@ if (typeof output !== "object" || output === null || Array.isArray(output)) {
 process.stdout.write(JSON.stringify(output));
 """
 
-    payload = {"config": config, "script": script}
+
+def ensure_js_runner() -> Path:
+    """Keep the runner on disk so node loads a file instead of parsing an `-e` argument."""
+    runner_path = cfg.paths.base_dir / ".override_runner.cjs"
+    if read_text(runner_path) != JS_OVERRIDE_RUNNER:
+        replace_text(runner_path, JS_OVERRIDE_RUNNER)
+    return runner_path
+
+
+def apply_js_override(config: dict[str, Any], script_text: str) -> dict[str, Any]:
+    script = (script_text or "").strip()
+    if not script:
+        return config
+    if is_identity_script(script):
+        # Same result as the node round-trip without spawning a process.
+        return config
+
+    runner_path = ensure_js_runner()
+    # Exchange compact UTF-8 bytes with node: no indentation, no locale-dependent
+    # text-mode encoding, and json.loads parses the stdout bytes directly.
+    payload = json.dumps(
+        {"config": config, "script": script},
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
     try:
         result = subprocess.run(
-            [cfg.runtime.node_bin, "-e", js_runner],
-            input=json.dumps(payload, ensure_ascii=False),
+            [cfg.runtime.node_bin, str(runner_path)],
+            input=payload,
             capture_output=True,
-            text=True,
             timeout=cfg.runtime.js_override_timeout,
         )
     except FileNotFoundError as exc:
@@ -601,14 +737,13 @@ process.stdout.write(JSON.stringify(output));
         raise RuntimeError("override.js execution timeout") from exc
 
     if result.returncode != 0:
-        stderr = result.stderr.strip() or "unknown js execution error"
+        stderr = result.stderr.decode("utf-8", errors="replace").strip() or "unknown js execution error"
         raise RuntimeError(stderr)
 
-    stdout = result.stdout.strip()
-    if not stdout:
+    if not result.stdout.strip():
         raise RuntimeError("override.js returned empty output")
 
-    parsed = json.loads(stdout)
+    parsed = json.loads(result.stdout)
     if not isinstance(parsed, dict):
         raise RuntimeError("override.js output must be a json object")
     return parsed
@@ -625,35 +760,41 @@ def merge_subscriptions() -> int:
     site_policy = load_yaml(cfg.script_paths.site_policy_file, {"groups": [], "rules": []})
     override_script = read_text(cfg.script_paths.override_script_file)
 
+    # Deduplicate as each subscription arrives so duplicates across subscriptions
+    # are dropped at ingest instead of being held until the end of the fetch stage.
     merged_proxies: list[dict[str, Any]] = []
-    enabled_count = 0
-
-    for sub in subscriptions:
-        if not isinstance(sub, dict):
-            continue
-        if not sub.get("enabled", True):
-            continue
-
+    seen_fingerprints: set[tuple[Any, ...]] = set()
+    enabled_subs = [sub for sub in subscriptions if isinstance(sub, dict) and sub.get("enabled", True)]
+    enabled_count = len(enabled_subs)
+
+    # Fetches are independent and network-bound, so run them concurrently but
+    # consume the results in subscription order to keep the merge deterministic.
+    with build_fetch_session() as session, ThreadPoolExecutor(
+        max_workers=max(1, min(SUB_FETCH_WORKERS, enabled_count))
+    ) as pool:
+        futures = [pool.submit(fetch_subscription, sub, session) for sub in enabled_subs]
+    for sub, future in zip(enabled_subs, futures):
         name = str(sub.get("name", "sub")).strip() or "sub"
-        enabled_count += 1
         try:
-            proxies, raw_text = fetch_subscription(sub)
-            merged_proxies.extend(proxies)
+            proxies, raw_text = future.result()
+            append_unique_proxies(merged_proxies, proxies, seen_fingerprints)
             save_yaml(cfg.paths.subs_dir / f"{name}.yaml", {"proxies": proxies})
             log(f"{name}: fetched={len(proxies)}")
             # Keep raw response for future debugging if needed.
             if sub.get("save_raw", False):
-                (cfg.paths.subs_dir / f"{name}.raw.txt").write_text(raw_text, encoding="utf-8")
+                replace_text(cfg.paths.subs_dir / f"{name}.raw.txt", raw_text)
         except Exception as exc:
             log(f"{name}: failed -> {exc}")
 
-    deduped = deduplicate_proxies(merged_proxies)
+    deduped = ensure_unique_proxy_names(merged_proxies)
     log(f"enabled_subscriptions={enabled_count}, merged_proxies={len(deduped)}")
 
     config = apply_subscription_data(template, deduped)
     proxy_names = [str(proxy.get("name", "")) for proxy in deduped if proxy.get("name")]
     config = apply_site_policy(config, site_policy, proxy_names)
-    config = deep_merge_config(config, override if isinstance(override, dict) else {})
+    # Every step above returns a config this merge owns, so the override can be
+    # merged into it in place rather than through another full deepcopy.
+    _merge_into(config, override if isinstance(override, dict) else {})
     if override_script.strip():
         log("applying override.js")
         config = apply_js_override(config, override_script)